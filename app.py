@@ -1,31 +1,97 @@
-from flask import Flask, request
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from flask_restx import Api, Resource, fields
 from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import BadRequest
 from werkzeug.utils import secure_filename
 import os
+import atexit
+import math
 import logging
-from typing import List, Dict, Any
-import json
+import logging.handlers
+import multiprocessing
+import queue
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Final, Optional, Tuple
+import msgpack
+import numpy as np
+import orjson
 
 from embedding_service import EmbeddingService
-from config import Config
-from pdf_extractor import PDFExtractor
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from config import load_config
+from pdf_extractor import PDFExtractor, PDFSession
+from semantic_cache import SemanticCache
+from job_queue import JobQueue, JobError
+from resilience import ServiceUnavailableError
+
+# Configure logging: request threads only enqueue records, and a background
+# listener thread writes them to stderr
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# Only merge args into the message here; the listener's handler applies the full format
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
+_log_listener = None
+
+def _start_log_listener():
+    global _log_listener
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+    _log_listener.start()
+
+_start_log_listener()
+# The listener thread does not survive fork (e.g. Gunicorn preload), so start a new one in the child
+os.register_at_fork(after_in_child=_start_log_listener)
+# Flush queued records on shutdown
+atexit.register(lambda: _log_listener.stop())
+
+config = load_config()
+
+# Upload size limit, checked on every PDF request
+_MAX_UPLOAD_BYTES: Final[int] = 50 * 1024 * 1024  # 50MB max file size
+_SPOOL_CHUNK: Final[int] = 1024 * 1024  # Bytes copied per step when spooling an upload to disk
+
+# orjson serializes NumPy arrays natively and parses/serializes several times faster than stdlib json
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Length of the text preview returned after adding a document
+TRUNC = 500
+
+# Extraction metadata reported back as extraction_info
+EXTRACTION_KEYS = ('page_count', 'char_count', 'word_count', 'file_size_bytes')
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Initialize Flask app
 app = Flask(__name__)
-app.config.from_object(Config)
+app.json = OrjsonProvider(app)
+app.config.from_object(config)
 
 # Configure file upload settings
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+app.config['MAX_CONTENT_LENGTH'] = _MAX_UPLOAD_BYTES
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
+# Compress JSON responses (embeddings serialize to ~40KB of float text each).
+# Binary and msgpack embeddings are near-random float32 and barely compress.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_BR_LEVEL'] = 4
+Compress(app)
+
 # Create uploads directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -39,9 +105,109 @@ api = Api(
     prefix='/api/v1'
 )
 
-# Initialize services
-embedding_service = EmbeddingService()
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Serialize Flask-RESTX responses with orjson"""
+    return Response(orjson.dumps(data, option=ORJSON_OPTIONS), status=code,
+                    headers=headers, mimetype='application/json')
+
+def _msgpack_default(obj):
+    """Pack NumPy values for msgpack: arrays become raw little-endian float32 bytes"""
+    if isinstance(obj, np.ndarray):
+        return obj.astype('<f4', copy=False).tobytes()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+@api.representation('application/x-msgpack')
+def output_msgpack(data, code, headers=None):
+    """Serialize responses as msgpack when the client sends Accept: application/x-msgpack"""
+    return Response(msgpack.packb(data, default=_msgpack_default), status=code,
+                    headers=headers, mimetype='application/x-msgpack')
+
+# Services are created by init_services(), not at import: spawned PDF workers
+# re-import the main script (as __mp_main__ under `python app.py`) and must not
+# open Chroma or start their own warmup
+embedding_service: Optional[EmbeddingService] = None
+semantic_cache: Optional[SemanticCache] = None
+pdf_jobs: Optional[JobQueue] = None
 pdf_extractor = PDFExtractor()
+_services_lock = threading.Lock()
+
+# Warm up Gemini and Chroma off the request path; /health reports 503 until done
+READY = threading.Event()
+_MAX_READY_WAIT = 30.0  # Longest /health/ready will hold a request open
+
+def _warmup():
+    """Pay connection setup and index load costs before serving traffic"""
+    try:
+        if embedding_service.generate_embedding("warmup") is None:
+            logger.warning("Warmup could not reach the Gemini API")
+        else:
+            embedding_service.search_similar("warmup", k=1)
+            logger.info("Warmup complete")
+    except Exception as e:
+        logger.warning("Warmup failed: %s", e)
+    finally:
+        READY.set()
+
+def init_services():
+    """Create the services for this process and start warmup (idempotent)"""
+    global embedding_service, semantic_cache, pdf_jobs
+    with _services_lock:
+        if embedding_service is not None:
+            return
+        
+        semantic_cache = SemanticCache(
+            maxsize=config.CACHE_SIZE,
+            ttl=config.SEMANTIC_CACHE_TTL,
+            threshold=config.SEMANTIC_CACHE_THRESHOLD,
+            search_slots=config.SEMANTIC_CACHE_SEARCH_SLOTS
+        )
+        # Large PDFs are extracted and embedded in the background; clients poll
+        # /documents/jobs/<id>, which any worker can answer from the shared job DB
+        pdf_jobs = JobQueue(config.PDF_JOB_DB, max_workers=config.PDF_JOB_WORKERS, ttl=config.PDF_JOB_TTL)
+        # Assigned last: handlers treat a non-None embedding_service as "initialized"
+        embedding_service = EmbeddingService(
+            cache_size=config.CACHE_SIZE,
+            rate_limit=config.GEMINI_RATE_LIMIT,
+            rate_burst=config.GEMINI_RATE_BURST,
+            rate_wait=config.GEMINI_RATE_WAIT,
+            breaker_fail_max=config.GEMINI_BREAKER_FAIL_MAX,
+            breaker_reset_timeout=config.GEMINI_BREAKER_RESET_TIMEOUT,
+            embed_workers=config.EMBED_WORKERS,
+            sync_interval=config.COLLECTION_SYNC_INTERVAL,
+            persist_path=config.CHROMA_DB_PATH
+        )
+        threading.Thread(target=_warmup, name="warmup", daemon=True).start()
+
+def create_app() -> Flask:
+    """App factory for WSGI servers: initialize this process's services and return the app"""
+    init_services()
+    return app
+
+@app.before_request
+def _ensure_services():
+    # Servers that import app:app directly instead of calling create_app()
+    if embedding_service is None:
+        init_services()
+
+# PDF parsing is CPU-bound, so it runs in worker processes outside the GIL
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Create the PDF worker pool on first use in this process"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Spawned rather than forked so workers don't inherit Chroma/gRPC threads,
+            # and created lazily so each server worker process owns its own pool
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=config.PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pdf_pool
 
 # Define API namespaces
 ns_health = api.namespace('health', description='Health check operations')
@@ -62,12 +228,34 @@ embed_response_model = api.model('EmbedResponse', {
     'dimension': fields.Integer(description='Embedding dimension')
 })
 
+embed_batch_request_model = api.model('EmbedBatchRequest', {
+    'texts': fields.List(fields.String, required=True, description='Texts to generate embeddings for', example=['First text', 'Second text']),
+    'batch_size': fields.Integer(description='Texts per Gemini API call', default=100, example=100)
+})
+
+embed_batch_response_model = api.model('EmbedBatchResponse', {
+    'texts': fields.List(fields.String, description='Input texts'),
+    'embeddings': fields.List(fields.List(fields.Float), description='Generated embedding vectors'),
+    'dimension': fields.Integer(description='Embedding dimension'),
+    'count': fields.Integer(description='Number of embeddings returned')
+})
+
 # Text-based document request
 add_text_document_model = api.model('AddTextDocument', {
     'text': fields.String(required=True, description='Document text to add', example='The lighthouse keeper watched over ships in the stormy night.'),
     'metadata': fields.Raw(description='Optional metadata dictionary', example={'category': 'story', 'theme': 'lighthouse'})
 })
 
+add_documents_batch_request_model = api.model('AddDocumentsBatch', {
+    'documents': fields.List(fields.Nested(add_text_document_model), required=True, description='Text documents to add')
+})
+
+add_documents_batch_response_model = api.model('AddDocumentsBatchResponse', {
+    'document_ids': fields.List(fields.String, description='Document IDs, in request order'),
+    'count': fields.Integer(description='Number of documents in the request'),
+    'message': fields.String(description='Success message')
+})
+
 # PDF document response model
 pdf_extraction_info_model = api.model('PDFExtractionInfo', {
     'source_type': fields.String(description='Source type'),
@@ -90,6 +278,14 @@ add_document_response_model = api.model('AddDocumentResponse', {
     'extraction_info': fields.Raw(description='Additional extraction information for PDFs')
 })
 
+pdf_job_model = api.model('PDFJob', {
+    'job_id': fields.String(description='Background job ID'),
+    'status': fields.String(description='queued, processing, completed or failed'),
+    'result': fields.Raw(description='Upload response once completed'),
+    'error': fields.String(description='Error message if failed'),
+    'message': fields.String(description='Status message')
+})
+
 search_request_model = api.model('SearchRequest', {
     'query': fields.String(required=True, description='Search query text', example='lighthouse and sea stories'),
     'k': fields.Integer(description='Number of results to return', default=5, example=3)
@@ -111,7 +307,12 @@ search_response_model = api.model('SearchResponse', {
 
 health_response_model = api.model('HealthResponse', {
     'status': fields.String(description='Health status'),
-    'services': fields.Raw(description='Service status details')
+    'services': fields.Raw(description='Service status details'),
+    'gemini_circuit': fields.Raw(description='Gemini circuit breaker state')
+})
+
+ready_response_model = api.model('ReadyResponse', {
+    'status': fields.String(description='"ready" once warmup has finished, otherwise "starting"')
 })
 
 collection_info_model = api.model('CollectionInfo', {
@@ -129,10 +330,141 @@ cache_stats_model = api.model('CacheStats', {
     'hit_rate': fields.Float(description='Cache hit rate (0-1)')
 })
 
+semantic_cache_stats_model = api.model('SemanticCacheStats', {
+    'embedding_hits': fields.Integer(description='Query embeddings served from cache'),
+    'embedding_misses': fields.Integer(description='Query embeddings not found in cache'),
+    'embedding_cache_size': fields.Integer(description='Cached query embeddings'),
+    'search_exact_hits': fields.Integer(description='Searches served for an identical query'),
+    'search_similar_hits': fields.Integer(description='Searches served for a similar query'),
+    'search_misses': fields.Integer(description='Searches sent to the vector database'),
+    'search_cache_size': fields.Integer(description='Cached search results'),
+    'similarity_threshold': fields.Float(description='Cosine similarity needed to reuse a result'),
+    'hit_rate': fields.Float(description='Overall hit rate (0-1)')
+})
+
 error_model = api.model('Error', {
     'error': fields.String(description='Error message')
 })
 
+def _binary_embedding_response(embeddings: np.ndarray) -> Response:
+    """Return embeddings as raw float32 bytes, shape given in headers"""
+    matrix = np.atleast_2d(embeddings)
+    return Response(
+        embeddings.astype('<f4', copy=False).tobytes(),
+        mimetype='application/octet-stream',
+        headers={
+            'X-Embedding-Count': str(matrix.shape[0]),
+            'X-Embedding-Dimension': str(matrix.shape[1])
+        }
+    )
+
+def _spool_upload(stream) -> Tuple[str, int]:
+    """Copy an upload stream to a temp file in UPLOAD_FOLDER, stopping once it exceeds the size limit
+
+    Returns the file path and the number of bytes written; the caller owns the file.
+    """
+    with tempfile.NamedTemporaryFile(dir=app.config['UPLOAD_FOLDER'], suffix='.pdf', delete=False) as spool:
+        size = 0
+        while size <= _MAX_UPLOAD_BYTES and (chunk := stream.read(_SPOOL_CHUNK)):
+            spool.write(chunk)
+            size += len(chunk)
+    return spool.name, size
+
+def _parse_text_request(data: Dict[str, Any], key: str = 'text', label: str = 'Text') -> str:
+    """Return the stripped text field, raising BadRequest if it is empty or too long"""
+    value = data[key]
+    text = value.strip() if value else ''
+    if not text:
+        raise BadRequest(f"{label} cannot be empty")
+    if len(text) > config.MAX_TEXT_LENGTH:
+        raise BadRequest(f"{label} exceeds maximum length of {config.MAX_TEXT_LENGTH} characters")
+    return text
+
+def _service_unavailable(error: str, retry_after: float):
+    """503 response telling clients when to retry"""
+    return {"error": error}, 503, {"Retry-After": str(math.ceil(retry_after))}
+
+def _get_query_embedding(text: str) -> Tuple[Optional[np.ndarray], bool]:
+    """Embed text, going through the semantic cache first
+
+    Returns the embedding and whether either cache already had it.
+    """
+    embedding = semantic_cache.get_embedding(text)
+    if embedding is not None:
+        return embedding, True
+    
+    embedding, cache_hit = embedding_service.generate_embedding_with_status(text)
+    if embedding is not None:
+        semantic_cache.put_embedding(text, embedding)
+    return embedding, cache_hit
+
+def _process_pdf(session: PDFSession, filename: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract, embed and store an uploaded PDF, returning the response body
+
+    Takes ownership of the session and closes it once text is extracted.
+    """
+    # Extract text from PDF in worker processes
+    try:
+        with session:
+            extraction_result = pdf_extractor.extract_text_parallel(
+                session, filename, get_pdf_pool(),
+                max_tasks=config.PDF_WORKERS,
+                timeout=config.PDF_EXTRACTION_TIMEOUT,
+                pages_per_task=config.PDF_PAGES_PER_TASK
+            )
+    except ValueError as ve:
+        raise JobError(str(ve), 400)
+    except FutureTimeoutError:
+        logger.error("PDF extraction timed out: %s", filename)
+        raise JobError("PDF extraction timed out", 504)
+    except Exception as e:
+        logger.error("PDF extraction error: %s", e)
+        raise JobError("Failed to extract text from PDF", 500)
+    
+    # Flatten PDF metadata for Chroma compatibility
+    pdf_metadata = extraction_result['metadata']
+    
+    # Flatten nested pdf_metadata to top-level keys with prefix,
+    # keeping only non-empty values converted to string
+    nested_metadata = pdf_metadata.pop('pdf_metadata', {})
+    pdf_metadata.update({f'pdf_{key}': str(value) for key, value in nested_metadata.items() if value})
+    
+    # Merge with user metadata (user metadata takes precedence)
+    pdf_metadata.update(metadata)
+    
+    # Add document to vector database
+    try:
+        doc_id = embedding_service.add_document(
+            extraction_result['text'], 
+            pdf_metadata
+        )
+    except ServiceUnavailableError as e:
+        raise JobError(str(e), 503, retry_after=e.retry_after)
+    
+    if doc_id is None:
+        raise JobError("Failed to add document to vector database", 500)
+    
+    semantic_cache.invalidate_search()
+    
+    # Prepare response
+    text = extraction_result['text']
+    page_count, char_count, word_count, file_size_bytes = (pdf_metadata[key] for key in EXTRACTION_KEYS)
+    response = {
+        "document_id": doc_id,
+        "text": text[:TRUNC] + "..." if len(text) > TRUNC else text,
+        "metadata": pdf_metadata,
+        "message": "PDF document processed and added successfully",
+        "extraction_info": {
+            "pages_processed": page_count,
+            "total_characters": char_count,
+            "total_words": word_count,
+            "file_size_mb": round(file_size_bytes / (1024*1024), 2)
+        }
+    }
+    
+    logger.info("Successfully processed PDF: %s", pdf_metadata['filename'])
+    return response
+
 # File upload parser
 file_upload_parser = api.parser()
 file_upload_parser.add_argument('file', location='files', type=FileStorage, required=True, help='PDF file to upload')
@@ -144,57 +476,144 @@ class HealthCheck(Resource):
     @ns_health.doc('health_check')
     @ns_health.marshal_with(health_response_model)
     @ns_health.response(200, 'Success', health_response_model)
+    @ns_health.response(503, 'Warming up', health_response_model)
     @ns_health.response(500, 'Service Unavailable', error_model)
     def get(self):
         """Check service health and connectivity"""
         try:
+            if not READY.is_set():
+                return {"status": "starting", "services": {"gemini_api": False, "chroma_db": False}}, 503
+            
             test_result = embedding_service.test_connection()
             return {
                 "status": "healthy",
                 "services": {
                     "gemini_api": test_result.get("gemini", False),
                     "chroma_db": test_result.get("chroma", False)
-                }
+                },
+                "gemini_circuit": embedding_service.breaker.get_stats()
             }, 200
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             return {"error": str(e)}, 500
 
+@ns_health.route('/ready')
+class ReadinessCheck(Resource):
+    @ns_health.doc('readiness_check')
+    @ns_health.param('timeout', f'Seconds to wait for warmup (default and max {_MAX_READY_WAIT:g})', _in='query', type=float)
+    @ns_health.response(200, 'Ready', ready_response_model)
+    @ns_health.response(400, 'Bad Request', error_model)
+    @ns_health.response(503, 'Still warming up', ready_response_model)
+    def get(self):
+        """Wait until warmup has finished, so callers need one request instead of polling"""
+        try:
+            timeout = float(request.args.get('timeout', _MAX_READY_WAIT))
+        except ValueError:
+            return {"error": "timeout must be a number"}, 400
+        
+        if READY.wait(min(max(timeout, 0.0), _MAX_READY_WAIT)):
+            return {"status": "ready"}, 200
+        return {"status": "starting"}, 503
+
 # Embedding Endpoints
 @ns_embed.route('/')
 class GenerateEmbedding(Resource):
     @ns_embed.doc('generate_embedding')
     @ns_embed.expect(embed_request_model, validate=True)
-    @ns_embed.marshal_with(embed_response_model)
+    @ns_embed.param('format', 'Set to "binary" to receive raw little-endian float32 bytes', _in='query')
+    @ns_embed.header('X-Cache', 'HIT if the embedding was already cached, otherwise MISS')
     @ns_embed.response(200, 'Success', embed_response_model)
     @ns_embed.response(400, 'Bad Request', error_model)
     @ns_embed.response(500, 'Internal Server Error', error_model)
+    @ns_embed.response(503, 'Gemini unavailable or rate limited', error_model)
     def post(self):
         """Generate embedding for given text"""
         try:
-            data = request.json
-            text = data['text'].strip()
-            
-            if not text:
-                return {"error": "Text cannot be empty"}, 400
-            
-            embedding = embedding_service.generate_embedding(text)
+            text = _parse_text_request(request.json)
             
+            embedding, cache_hit = _get_query_embedding(text)
             if embedding is None:
                 return {"error": "Failed to generate embedding"}, 500
             
+            cache_header = {"X-Cache": "HIT" if cache_hit else "MISS"}
+            if request.args.get('format') == 'binary':
+                response = _binary_embedding_response(embedding)
+                response.headers.update(cache_header)
+                return response
+            
+            # orjson serializes the ndarray directly, no per-float Python objects
             return {
                 "text": text,
-                "embedding": embedding.tolist(),
+                "embedding": embedding,
                 "dimension": len(embedding)
+            }, 200, cache_header
+            
+        except BadRequest as e:
+            return {"error": e.description}, 400
+        except ServiceUnavailableError as e:
+            return _service_unavailable(str(e), e.retry_after)
+        except Exception as e:
+            logger.error("Error generating embedding: %s", e)
+            return {"error": "Internal server error"}, 500
+
+@ns_embed.route('/batch')
+class GenerateEmbeddingBatch(Resource):
+    @ns_embed.doc('generate_embedding_batch')
+    @ns_embed.expect(embed_batch_request_model, validate=True)
+    @ns_embed.param('format', 'Set to "binary" to receive a raw row-major float32 matrix', _in='query')
+    @ns_embed.response(200, 'Success', embed_batch_response_model)
+    @ns_embed.response(400, 'Bad Request', error_model)
+    @ns_embed.response(500, 'Internal Server Error', error_model)
+    @ns_embed.response(503, 'Gemini unavailable or rate limited', error_model)
+    def post(self):
+        """Generate embeddings for many texts in batched API calls"""
+        try:
+            data = request.json
+            batch_size = data.get('batch_size', config.EMBED_BATCH_SIZE)
+            
+            if not data['texts']:
+                return {"error": "Texts cannot be empty"}, 400
+            
+            if len(data['texts']) > config.MAX_BATCH_TEXTS:
+                return {"error": f"At most {config.MAX_BATCH_TEXTS} texts per request"}, 400
+            
+            # Same per-text checks as /embed/; the first bad item fails the request
+            texts = [_parse_text_request({'text': text}, label=f"texts[{i}]")
+                     for i, text in enumerate(data['texts'])]
+            
+            if not isinstance(batch_size, int) or batch_size <= 0:
+                return {"error": "batch_size must be a positive integer"}, 400
+            
+            embeddings = embedding_service.generate_embeddings_batch(
+                texts, 
+                min(batch_size, config.EMBED_BATCH_SIZE)
+            )
+            
+            if embeddings is None:
+                return {"error": "Failed to generate embeddings"}, 500
+            
+            matrix = np.stack(embeddings)
+            if request.args.get('format') == 'binary':
+                return _binary_embedding_response(matrix)
+            
+            return {
+                "texts": texts,
+                "embeddings": matrix,
+                "dimension": matrix.shape[1],
+                "count": matrix.shape[0]
             }, 200
             
+        except BadRequest as e:
+            return {"error": e.description}, 400
+        except ServiceUnavailableError as e:
+            return _service_unavailable(str(e), e.retry_after)
         except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
+            logger.error("Error generating batch embeddings: %s", e)
             return {"error": "Internal server error"}, 500
 
 # Document Management Endpoints
-@ns_docs.route('/text')
+# '/' is the original endpoint, kept for backward compatibility
+@ns_docs.route('/text', '/')
 class AddTextDocument(Resource):
     @ns_docs.doc('add_text_document')
     @ns_docs.expect(add_text_document_model, validate=True)
@@ -202,16 +621,14 @@ class AddTextDocument(Resource):
     @ns_docs.response(201, 'Document Added', add_document_response_model)
     @ns_docs.response(400, 'Bad Request', error_model)
     @ns_docs.response(500, 'Internal Server Error', error_model)
+    @ns_docs.response(503, 'Gemini unavailable or rate limited', error_model)
     def post(self):
         """Add text document to vector database"""
         try:
             data = request.json
-            text = data['text'].strip()
+            text = _parse_text_request(data)
             metadata = data.get('metadata', {})
             
-            if not text:
-                return {"error": "Text cannot be empty"}, 400
-            
             # Add source type to metadata
             metadata['source_type'] = 'text'
             
@@ -220,6 +637,8 @@ class AddTextDocument(Resource):
             if doc_id is None:
                 return {"error": "Failed to add document"}, 500
             
+            semantic_cache.invalidate_search()
+            
             return {
                 "document_id": doc_id,
                 "text": text,
@@ -227,21 +646,76 @@ class AddTextDocument(Resource):
                 "message": "Text document added successfully"
             }, 201
             
+        except BadRequest as e:
+            return {"error": e.description}, 400
+        except ServiceUnavailableError as e:
+            return _service_unavailable(str(e), e.retry_after)
         except Exception as e:
-            logger.error(f"Error adding text document: {e}")
+            logger.error("Error adding text document: %s", e)
+            return {"error": "Internal server error"}, 500
+
+@ns_docs.route('/batch')
+class AddTextDocumentsBatch(Resource):
+    @ns_docs.doc('add_text_documents_batch')
+    @ns_docs.expect(add_documents_batch_request_model, validate=True)
+    @ns_docs.response(201, 'Documents Added', add_documents_batch_response_model)
+    @ns_docs.response(400, 'Bad Request', error_model)
+    @ns_docs.response(500, 'Internal Server Error', error_model)
+    @ns_docs.response(503, 'Gemini unavailable or rate limited', error_model)
+    def post(self):
+        """Add many text documents with batched embedding calls"""
+        try:
+            documents = request.json['documents']
+            
+            if not documents:
+                return {"error": "Documents cannot be empty"}, 400
+            
+            if len(documents) > config.MAX_BATCH_TEXTS:
+                return {"error": f"At most {config.MAX_BATCH_TEXTS} documents per request"}, 400
+            
+            texts = [_parse_text_request(document) for document in documents]
+            metadatas = [dict(document.get('metadata') or {}, source_type='text') for document in documents]
+            
+            doc_ids = embedding_service.add_documents(texts, metadatas, config.EMBED_BATCH_SIZE)
+            
+            if doc_ids is None:
+                return {"error": "Failed to add documents"}, 500
+            
+            semantic_cache.invalidate_search()
+            
+            return {
+                "document_ids": doc_ids,
+                "count": len(doc_ids),
+                "message": "Text documents added successfully"
+            }, 201
+            
+        except BadRequest as e:
+            return {"error": e.description}, 400
+        except ServiceUnavailableError as e:
+            return _service_unavailable(str(e), e.retry_after)
+        except Exception as e:
+            logger.error("Error adding text documents: %s", e)
             return {"error": "Internal server error"}, 500
 
 @ns_docs.route('/pdf')
 class AddPDFDocument(Resource):
     @ns_docs.doc('add_pdf_document')
     @ns_docs.expect(file_upload_parser)
+    @ns_docs.param('async', 'Set to "true" to process in the background (always used above PDF_ASYNC_THRESHOLD bytes)', _in='query')
     @ns_docs.response(201, 'PDF Document Added Successfully')
+    @ns_docs.response(202, 'Accepted for background processing', pdf_job_model)
     @ns_docs.response(400, 'Bad Request - Invalid file or format', error_model)
     @ns_docs.response(413, 'File too large', error_model)
     @ns_docs.response(500, 'Internal Server Error', error_model)
+    @ns_docs.response(503, 'Gemini unavailable or rate limited', error_model)
+    @ns_docs.response(504, 'PDF extraction timed out', error_model)
     def post(self):
         """Upload and add PDF document to vector database"""
         try:
+            # Reject oversized uploads before Werkzeug parses the multipart body
+            if request.content_length is not None and request.content_length > _MAX_UPLOAD_BYTES:
+                return {"error": "File too large. Maximum size: 50MB"}, 413
+            
             # Check if file is present
             if 'file' not in request.files:
                 return {"error": "No file provided"}, 400
@@ -253,136 +727,103 @@ class AddPDFDocument(Resource):
             # Get optional metadata
             metadata_str = request.form.get('metadata', '{}')
             try:
-                metadata = json.loads(metadata_str) if metadata_str else {}
-            except json.JSONDecodeError:
+                metadata = orjson.loads(metadata_str) if metadata_str else {}
+            except orjson.JSONDecodeError:
                 return {"error": "Invalid metadata JSON format"}, 400
             
             # Validate file type
             if not file.filename.lower().endswith('.pdf'):
                 return {"error": "Only PDF files are supported"}, 400
+            filename = secure_filename(file.filename)
             
-            # Read file content
-            file_content = file.read()
-            
-            # Validate PDF content
-            if not pdf_extractor.validate_pdf_file(file_content):
+            # Check PDF magic bytes before reading the whole upload
+            head = file.stream.read(5)
+            file.stream.seek(0)
+            if head != b'%PDF-':
                 return {"error": "Invalid PDF file"}, 400
             
-            # Extract text from PDF
-            try:
-                extraction_result = pdf_extractor.extract_text_from_bytes(
-                    file_content, 
-                    secure_filename(file.filename)
-                )
-            except ValueError as ve:
-                return {"error": str(ve)}, 400
-            except Exception as e:
-                logger.error(f"PDF extraction error: {e}")
-                return {"error": "Failed to extract text from PDF"}, 500
-            
-            # Flatten PDF metadata for Chroma compatibility
-            pdf_metadata = extraction_result['metadata']
-            
-            # Flatten nested pdf_metadata to top-level keys with prefix
-            nested_metadata = pdf_metadata.pop('pdf_metadata', {})
-            for key, value in nested_metadata.items():
-                # Only include non-empty values and convert to string
-                if value:
-                    pdf_metadata[f'pdf_{key}'] = str(value)
-            
-            # Merge with user metadata (user metadata takes precedence)
-            pdf_metadata.update(metadata)
-            
-            # Add document to vector database
-            doc_id = embedding_service.add_document(
-                extraction_result['text'], 
-                pdf_metadata
-            )
-            
-            if doc_id is None:
-                return {"error": "Failed to add document to vector database"}, 500
-            
-            # Prepare response
-            response = {
-                "document_id": doc_id,
-                "text": extraction_result['text'][:500] + "..." if len(extraction_result['text']) > 500 else extraction_result['text'],
-                "metadata": pdf_metadata,
-                "message": "PDF document processed and added successfully",
-                "extraction_info": {
-                    "pages_processed": pdf_metadata['page_count'],
-                    "total_characters": pdf_metadata['char_count'],
-                    "total_words": pdf_metadata['word_count'],
-                    "file_size_mb": round(pdf_metadata['file_size_bytes'] / (1024*1024), 2)
-                }
-            }
-            
-            logger.info(f"Successfully processed PDF: {pdf_metadata['filename']}")
-            return response, 201
+            # Spool to disk in chunks: PyMuPDF and the extraction workers open the
+            # file by path, so the upload is never held whole in Python memory
+            path, size = _spool_upload(file.stream)
+            if size > _MAX_UPLOAD_BYTES:
+                os.unlink(path)
+                return {"error": "File too large. Maximum size: 50MB"}, 413
             
-        except Exception as e:
-            logger.error(f"Error processing PDF upload: {e}")
-            return {"error": "Internal server error"}, 500
-
-# Keep the original /documents/ endpoint for backward compatibility
-@ns_docs.route('/')
-class AddDocument(Resource):
-    @ns_docs.doc('add_document_legacy', description='Legacy endpoint - use /text or /pdf instead')
-    @ns_docs.expect(add_text_document_model, validate=True)
-    @ns_docs.marshal_with(add_document_response_model)
-    @ns_docs.response(201, 'Document Added', add_document_response_model)
-    @ns_docs.response(400, 'Bad Request', error_model)
-    @ns_docs.response(500, 'Internal Server Error', error_model)
-    def post(self):
-        """Add text document to vector database (legacy endpoint)"""
-        try:
-            data = request.json
-            text = data['text'].strip()
-            metadata = data.get('metadata', {})
-            
-            if not text:
-                return {"error": "Text cannot be empty"}, 400
-            
-            metadata['source_type'] = 'text'
+            # Open the PDF once; validation and extraction share the document,
+            # and closing the session deletes the spooled file
+            try:
+                session = PDFSession(path, delete=True)
+            except Exception:
+                os.unlink(path)
+                return {"error": "Invalid PDF file"}, 400
             
-            doc_id = embedding_service.add_document(text, metadata)
+            # Validate PDF content
+            if not pdf_extractor.validate_pdf_file(session):
+                session.close()
+                return {"error": "Invalid PDF file"}, 400
             
-            if doc_id is None:
-                return {"error": "Failed to add document"}, 500
+            if size > config.PDF_ASYNC_THRESHOLD or request.args.get('async') == 'true':
+                job_id = pdf_jobs.submit(_process_pdf, session, filename, metadata)
+                return {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "message": "PDF accepted for background processing"
+                }, 202, {"Location": api.url_for(PDFJobStatus, job_id=job_id)}
             
-            return {
-                "document_id": doc_id,
-                "text": text,
-                "metadata": metadata,
-                "message": "Document added successfully"
-            }, 201
+            try:
+                return _process_pdf(session, filename, metadata), 201
+            except JobError as e:
+                if e.retry_after is not None:
+                    return _service_unavailable(e.message, e.retry_after)
+                return {"error": e.message}, e.status_code
             
         except Exception as e:
-            logger.error(f"Error adding document: {e}")
+            logger.error("Error processing PDF upload: %s", e)
             return {"error": "Internal server error"}, 500
 
+@ns_docs.route('/jobs/<string:job_id>')
+class PDFJobStatus(Resource):
+    @ns_docs.doc('pdf_job_status')
+    @ns_docs.response(200, 'Success', pdf_job_model)
+    @ns_docs.response(404, 'Job not found', error_model)
+    def get(self, job_id):
+        """Get the status of a background PDF upload"""
+        job = pdf_jobs.get(job_id)
+        if job is None:
+            return {"error": "Job not found"}, 404
+        return job, 200
+
 # Search Endpoints
 @ns_search.route('/')
 class SimilaritySearch(Resource):
     @ns_search.doc('similarity_search')
     @ns_search.expect(search_request_model, validate=True)
-    @ns_search.marshal_with(search_response_model)
     @ns_search.response(200, 'Success', search_response_model)
     @ns_search.response(400, 'Bad Request', error_model)
     @ns_search.response(500, 'Internal Server Error', error_model)
+    @ns_search.response(503, 'Gemini unavailable or rate limited', error_model)
     def post(self):
         """Perform similarity search in vector database"""
         try:
             data = request.json
-            query = data['query'].strip()
+            query = _parse_text_request(data, 'query', 'Query')
             k = data.get('k', 5)
             
-            if not query:
-                return {"error": "Query cannot be empty"}, 400
-            
             if not isinstance(k, int) or k <= 0:
                 return {"error": "k must be a positive integer"}, 400
             
-            results = embedding_service.search_similar(query, k)
+            semantic_cache.sync_collection_size(embedding_service.get_document_count())
+            results = semantic_cache.get_search(query, k)
+            if results is None:
+                query_embedding, _ = _get_query_embedding(query)
+                if query_embedding is None:
+                    return {"error": "Failed to generate query embedding"}, 500
+                
+                results = semantic_cache.get_similar_search(query_embedding, k)
+                if results is None:
+                    results = embedding_service.search_by_embedding(query_embedding, k)
+                    if results:
+                        semantic_cache.put_search(query, query_embedding, k, results)
             
             return {
                 "query": query,
@@ -390,8 +831,12 @@ class SimilaritySearch(Resource):
                 "count": len(results)
             }, 200
             
+        except BadRequest as e:
+            return {"error": e.description}, 400
+        except ServiceUnavailableError as e:
+            return _service_unavailable(str(e), e.retry_after)
         except Exception as e:
-            logger.error(f"Error in similarity search: {e}")
+            logger.error("Error in similarity search: %s", e)
             return {"error": "Internal server error"}, 500
 
 # Collection Management Endpoints
@@ -407,7 +852,7 @@ class CollectionInfo(Resource):
             info = embedding_service.get_collection_info()
             return info, 200
         except Exception as e:
-            logger.error(f"Error getting collection info: {e}")
+            logger.error("Error getting collection info: %s", e)
             return {"error": "Internal server error"}, 500
 
 @ns_collection.route('/reset')
@@ -419,6 +864,7 @@ class ResetCollection(Resource):
         """Reset the collection (delete all documents)"""
         try:
             success = embedding_service.reset_collection()
+            semantic_cache.invalidate_search()
             
             if success:
                 return {"message": "Collection reset successfully"}, 200
@@ -426,7 +872,7 @@ class ResetCollection(Resource):
                 return {"error": "Failed to reset collection"}, 500
                 
         except Exception as e:
-            logger.error(f"Error resetting collection: {e}")
+            logger.error("Error resetting collection: %s", e)
             return {"error": "Internal server error"}, 500
 
 # Cache Management Endpoints
@@ -440,9 +886,14 @@ class CacheStats(Resource):
         """Get cache statistics and performance metrics"""
         try:
             stats = embedding_service.get_cache_stats()
+            # Repeat queries are answered by the semantic cache before they reach
+            # the embedding service; its misses fall through and are counted there
+            stats['cache_hits'] += semantic_cache.get_stats()['embedding_hits']
+            total = stats['cache_hits'] + stats['cache_misses']
+            stats['hit_rate'] = stats['cache_hits'] / total if total > 0 else 0
             return stats, 200
         except Exception as e:
-            logger.error(f"Error getting cache stats: {e}")
+            logger.error("Error getting cache stats: %s", e)
             return {"error": "Internal server error"}, 500
 
 @ns_cache.route('/clear')
@@ -454,11 +905,41 @@ class ClearCache(Resource):
         """Clear the embedding cache"""
         try:
             embedding_service.clear_cache()
+            semantic_cache.clear()
             return {"message": "Cache cleared successfully"}, 200
         except Exception as e:
-            logger.error(f"Error clearing cache: {e}")
+            logger.error("Error clearing cache: %s", e)
             return {"error": "Internal server error"}, 500
 
+@ns_cache.route('/semantic/stats')
+class SemanticCacheStats(Resource):
+    @ns_cache.doc('semantic_cache_stats')
+    @ns_cache.marshal_with(semantic_cache_stats_model)
+    @ns_cache.response(200, 'Success', semantic_cache_stats_model)
+    @ns_cache.response(500, 'Internal Server Error', error_model)
+    def get(self):
+        """Get semantic cache statistics"""
+        try:
+            return semantic_cache.get_stats(), 200
+        except Exception as e:
+            logger.error("Error getting semantic cache stats: %s", e)
+            return {"error": "Internal server error"}, 500
+
+# Swagger spec is static once routes are registered, so serialize it only once
+_swagger_json = None
+
+def swagger_json():
+    """Serve the Swagger specification from pre-serialized bytes"""
+    global _swagger_json
+    if _swagger_json is None:
+        schema = api.__schema__
+        if "error" in schema:
+            return Response(orjson.dumps(schema), status=500, mimetype='application/json')
+        _swagger_json = orjson.dumps(schema, option=ORJSON_OPTIONS)
+    return Response(_swagger_json, mimetype='application/json')
+
+app.view_functions[api.endpoint('specs')] = swagger_json
+
 # Error handlers
 @api.errorhandler
 def default_error_handler(error):
@@ -475,8 +956,8 @@ if __name__ == '__main__':
     logger.info("Swagger UI available at: http://0.0.0.0:8081/docs/")
     logger.info("PDF Upload endpoint: POST /api/v1/documents/pdf")
     logger.info("Text Upload endpoint: POST /api/v1/documents/text")
-    app.run(
-        host=app.config['HOST'],
-        port=app.config['PORT'],
-        debug=app.config['DEBUG']
+    create_app().run(
+        host=config.HOST,
+        port=config.PORT,
+        debug=config.DEBUG
     )
\ No newline at end of file
@@ -1,41 +1,91 @@
 import os
+from dataclasses import dataclass, field, fields
+from functools import cache
+from typing import Optional
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration"""
-    
+    """Application configuration (immutable; use load_config() to read it)"""
+
     # Flask settings
-    HOST = '0.0.0.0'  # Hardcoded for deployment
-    PORT = 8081       # Hardcoded for deployment
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
-    
+    HOST: str = '0.0.0.0'  # Hardcoded for deployment
+    PORT: int = 8081       # Hardcoded for deployment
+    DEBUG: bool = False
+
     # API settings
-    MAX_TEXT_LENGTH = int(os.getenv('MAX_TEXT_LENGTH', 10000))
-    DEFAULT_SEARCH_RESULTS = int(os.getenv('DEFAULT_SEARCH_RESULTS', 5))
-    MAX_SEARCH_RESULTS = int(os.getenv('MAX_SEARCH_RESULTS', 50))
-    
+    MAX_TEXT_LENGTH: int = 10000
+    DEFAULT_SEARCH_RESULTS: int = 5
+    MAX_SEARCH_RESULTS: int = 50
+    EMBED_BATCH_SIZE: int = 100  # Gemini per-request limit
+    MAX_BATCH_TEXTS: int = 1000
+    EMBED_WORKERS: int = 8  # Concurrent Gemini calls per large batch request
+
+    # Upload settings
+    # Extraction processes per server worker: the cores split across the
+    # WEB_CONCURRENCY server workers (gunicorn_conf.py exports it)
+    PDF_WORKERS: int = field(
+        default_factory=lambda: max(1, (os.cpu_count() or 1) // int(os.getenv('WEB_CONCURRENCY', 1)))
+    )
+    PDF_EXTRACTION_TIMEOUT: int = 60
+    PDF_PAGES_PER_TASK: int = 50  # Larger PDFs are split into page ranges across PDF_WORKERS
+    PDF_ASYNC_THRESHOLD: int = 2 * 1024 * 1024  # Larger uploads are processed in the background
+    PDF_JOB_WORKERS: int = 2
+    PDF_JOB_TTL: int = 3600
+    PDF_JOB_DB: str = './chroma_db/pdf_jobs.sqlite3'  # Job status shared by all server workers
+
     # Cache settings
-    CACHE_SIZE = int(os.getenv('CACHE_SIZE', 1000))
-    
+    CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_THRESHOLD: float = 0.97
+    SEMANTIC_CACHE_TTL: int = 3600
+    SEMANTIC_CACHE_SEARCH_SLOTS: int = 256
+
     # Chroma settings
-    CHROMA_DB_PATH = os.getenv('CHROMA_DB_PATH', './chroma_db')
-    COLLECTION_NAME = os.getenv('COLLECTION_NAME', 'documents')
-    
+    CHROMA_DB_PATH: str = './chroma_db'
+    COLLECTION_NAME: str = 'documents'
+    COLLECTION_SYNC_INTERVAL: float = 5.0  # Seconds between checks for writes by other workers
+
     # Gemini settings
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-embedding-001')
-    EMBEDDING_DIMENSION = int(os.getenv('EMBEDDING_DIMENSION', 3072))
-    
+    GEMINI_API_KEY: Optional[str] = field(default=None, repr=False)
+    GEMINI_MODEL: str = 'gemini-embedding-001'
+    EMBEDDING_DIMENSION: int = 3072
+    GEMINI_RATE_LIMIT: float = 50.0        # Requests per second, per worker process
+    GEMINI_RATE_BURST: float = 50.0
+    GEMINI_RATE_WAIT: float = 1.0          # Max seconds to queue for a token before 503
+    GEMINI_BREAKER_FAIL_MAX: int = 5
+    GEMINI_BREAKER_RESET_TIMEOUT: float = 30.0
+
     # Logging
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    
-    @classmethod
-    def validate(cls):
+    LOG_LEVEL: str = 'INFO'
+
+    def validate(self):
         """Validate required configuration"""
-        if not cls.GEMINI_API_KEY:
+        if not self.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY environment variable is required")
-        
-        return True
\ No newline at end of file
+
+        return True
+
+
+# Settings that environment variables must not override
+_HARDCODED = ('HOST', 'PORT')
+
+_PARSERS = {
+    bool: lambda value: value.lower() == 'true',
+    int: int,
+    float: float,
+}
+
+
+@cache
+def load_config() -> Config:
+    """Build the configuration from the environment once per process"""
+    overrides = {}
+    for f in fields(Config):
+        value = os.getenv(f.name)
+        if value is not None and f.name not in _HARDCODED:
+            overrides[f.name] = _PARSERS.get(f.type, str)(value)
+    return Config(**overrides)
@@ -0,0 +1,28 @@
+import httpx
+import pytest
+import pytest_asyncio
+
+from test_support import BASE_URL, create_client, seed_documents
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "serial: run outside the pytest-xdist parallel pass")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    # Session scope is per process, so each pytest-xdist worker gets its own pool
+    async with create_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def sync_client():
+    # pytest-benchmark times synchronous callables, so latency tests use a blocking client
+    with httpx.Client(base_url=BASE_URL) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def seed_docs(client):
+    yield await seed_documents(client)
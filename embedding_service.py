@@ -11,19 +11,35 @@ except ImportError:
 
 import chromadb
 from chromadb.config import Settings
+from chromadb.errors import NotFoundError
 import hashlib
 import logging
-from functools import lru_cache
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from google import genai
+from google.genai.errors import ClientError
 from google.genai.types import EmbedContentConfig
 
+from resilience import CircuitBreaker, ServiceUnavailableError, TokenBucket
+from vector_mirror import VectorMirror
+
 logger = logging.getLogger(__name__)
 
+# Embeddings are unit-normalized, so inner product equals cosine similarity.
+# id_hash records how document IDs are derived from text (see _create_text_hash)
+COLLECTION_METADATA = {"description": "Document embeddings collection", "hnsw:space": "ip", "id_hash": "blake2b"}
+
 
 class EmbeddingService:
-    def __init__(self, collection_name: str = "documents", cache_size: int = 1000):
+    def __init__(self, collection_name: str = "documents", cache_size: int = 1000,
+                 mirror_max_size: int = 100_000, rate_limit: float = 50.0, rate_burst: float = 50.0,
+                 rate_wait: float = 1.0, breaker_fail_max: int = 5, breaker_reset_timeout: float = 30.0,
+                 embed_workers: int = 8, rerank_factor: int = 4, sync_interval: float = 5.0,
+                 persist_path: str = "./chroma_db"):
         """Initialize embedding service with Chroma and LRU cache"""
         # Load environment variables
         load_dotenv()
@@ -37,9 +53,18 @@ class EmbeddingService:
         self.model_name = "gemini-embedding-001"
         self.dimension = 3072
         
+        # Protect Gemini (and our workers) from retry storms: cap the request
+        # rate and fail fast while the API keeps erroring
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_burst)
+        self.rate_wait = rate_wait
+        self.breaker = CircuitBreaker("gemini", fail_max=breaker_fail_max, reset_timeout=breaker_reset_timeout)
+        
+        # Batches of a large request are embedded concurrently; API calls wait on the network
+        self._executor = ThreadPoolExecutor(max_workers=embed_workers, thread_name_prefix="embed")
+        
         # Initialize Chroma client
         self.chroma_client = chromadb.PersistentClient(
-            path="./chroma_db",
+            path=persist_path,
             settings=Settings(
                 anonymized_telemetry=False,
                 allow_reset=True
@@ -50,39 +75,132 @@ class EmbeddingService:
         self.collection_name = collection_name
         try:
             self.collection = self.chroma_client.get_collection(name=collection_name)
-            logger.info(f"Loaded existing collection: {collection_name}")
+            logger.info("Loaded existing collection: %s", collection_name)
         except:
             self.collection = self.chroma_client.create_collection(
                 name=collection_name,
-                metadata={"description": "Document embeddings collection"}
+                metadata=COLLECTION_METADATA
             )
-            logger.info(f"Created new collection: {collection_name}")
+            logger.info("Created new collection: %s", collection_name)
+        
+        self._apply_collection_metadata()
+        
+        # Candidates fetched per requested result when searching through Chroma
+        self.rerank_factor = rerank_factor
         
-        # Cache statistics
+        # Exact in-process index used for search while the collection is small
+        self.mirror = VectorMirror(self.dimension, max_size=mirror_max_size, space=self.space)
+        self.mirror.load(self.collection)
+        
+        # Collection size as last seen by this process, so searches skip count().
+        # Writes here update it under _write_lock; writes by other server workers
+        # are picked up by a background thread that also rebuilds the mirror
+        self._doc_count = self.collection.count()
+        self._write_lock = threading.Lock()
+        self._sync_interval = sync_interval
+        if sync_interval > 0:
+            threading.Thread(target=self._sync_loop, name="collection-sync", daemon=True).start()
+        
+        # Embedding cache keyed by text hash (LRU order)
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.cache_hits = 0
         self.cache_misses = 0
         self.cache_size = cache_size
         
         logger.info("EmbeddingService initialized successfully")
     
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Scale an embedding to unit length"""
+        return embedding / (np.linalg.norm(embedding) + 1e-12)
+    
+    def _similarity(self, distance: float) -> float:
+        """Convert a collection distance on unit vectors into a 0-1 similarity score"""
+        if self.space == "ip":
+            score = 1.0 - distance        # distance = 1 - cos
+        else:
+            score = 1.0 - distance / 2.0  # squared L2 = 2 - 2cos
+        return min(max(score, 0.0), 1.0)
+    
+    def _apply_collection_metadata(self):
+        """Read per-collection settings; collections from older releases lack the newer keys"""
+        metadata = self.collection.metadata or {}
+        # Collections created before the switch to inner product keep Chroma's default L2
+        self.space = metadata.get("hnsw:space", "l2")
+        # Collections created before the switch to BLAKE2b keep MD5 IDs, so
+        # re-ingesting a text still maps to its existing row
+        self.id_hash = metadata.get("id_hash", "md5")
+    
     def _create_text_hash(self, text: str) -> str:
         """Create a hash for text to use as document ID"""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        data = text.encode('utf-8')
+        if self.id_hash == "md5":
+            return hashlib.md5(data).hexdigest()
+        # Non-cryptographic use; BLAKE2b is faster than MD5 and keeps the 32-char hex ID
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
     
-    @lru_cache(maxsize=1000)
-    def _generate_embedding_cached(self, text_hash: str, text: str) -> Optional[np.ndarray]:
-        """Generate embedding with LRU cache"""
-        self.cache_misses += 1
+    def _embed_content(self, contents: List[str]):
+        """Call the Gemini embedding API through the circuit breaker and rate limiter"""
+        # Breaker first, so an open circuit fails fast without waiting for or spending a token
+        self.breaker.before_call()
+        if not self.rate_limiter.acquire(timeout=self.rate_wait):
+            self.breaker.record_neutral()
+            raise ServiceUnavailableError("Gemini rate limit exceeded", 1 / self.rate_limiter.rate)
+        
         try:
             response = self.client.models.embed_content(
                 model=self.model_name,
-                contents=[text],
+                contents=contents,
                 config=EmbedContentConfig(
                     task_type="RETRIEVAL_DOCUMENT",
                     output_dimensionality=self.dimension,
                     title="Document Embedding"
                 )
             )
+        except ClientError as e:
+            # Bad requests are the caller's fault and prove nothing about upstream
+            # health; only quota errors count against it
+            if e.code == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_neutral()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        return response
+    
+    def _cache_get(self, text_hash: str) -> Optional[np.ndarray]:
+        """Look up a cached embedding, counting the hit or miss"""
+        with self._cache_lock:
+            embedding = self._cache.get(text_hash)
+            if embedding is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(text_hash)
+            self.cache_hits += 1
+            return embedding
+    
+    def _cache_put(self, text_hash: str, embedding: np.ndarray) -> np.ndarray:
+        """Store an embedding, evicting the least recently used entry when full
+
+        Kept at full float32 precision, so a cache hit returns exactly what the
+        miss returned and what was written to Chroma.
+        """
+        with self._cache_lock:
+            self._cache[text_hash] = embedding
+            self._cache.move_to_end(text_hash)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+    
+    def _request_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Generate an embedding with the Gemini API"""
+        try:
+            response = self._embed_content([text])
             
             # Handle different response structures
             if hasattr(response, 'embedding'):
@@ -90,48 +208,96 @@ class EmbeddingService:
             elif hasattr(response, 'embeddings') and len(response.embeddings) > 0:
                 embedding = np.array(response.embeddings[0].values, dtype=np.float32)
             else:
-                logger.error(f"Unexpected response structure: {response}")
+                logger.error("Unexpected response structure: %s", response)
                 return None
             
-            logger.debug(f"Generated embedding for text hash: {text_hash}")
-            return embedding
+            return self._normalize(embedding)
             
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
+            logger.error("Error generating embedding: %s", e)
             return None
     
     def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """Generate embedding for text with caching"""
-        text_hash = self._create_text_hash(text)
+        return self._embed_with_id(text, self._create_text_hash(text))
+    
+    def generate_embedding_with_status(self, text: str) -> Tuple[Optional[np.ndarray], bool]:
+        """Generate embedding for text, also reporting whether it was a cache hit"""
+        return self._embed_with_status(text, self._create_text_hash(text))
+    
+    def _embed_with_id(self, text: str, text_hash: str) -> Optional[np.ndarray]:
+        """Generate embedding for text whose hash the caller already computed"""
+        return self._embed_with_status(text, text_hash)[0]
+    
+    def _embed_with_status(self, text: str, text_hash: str) -> Tuple[Optional[np.ndarray], bool]:
+        embedding = self._cache_get(text_hash)
+        if embedding is not None:
+            logger.debug("Cache hit for text: %s...", text[:50])
+            return embedding, True
         
-        # Check if embedding is cached
+        embedding = self._request_embedding(text)
+        if embedding is not None:
+            embedding = self._cache_put(text_hash, embedding)
+            logger.debug("Generated embedding for text hash: %s", text_hash)
+        return embedding, False
+    
+    def generate_embeddings_batch(self, texts: List[str], batch_size: int = 100) -> Optional[List[np.ndarray]]:
+        """Generate embeddings for many texts, calling the API once per batch of cache misses"""
+        return self._embed_batch_with_ids(texts, [self._create_text_hash(text) for text in texts], batch_size)
+    
+    def _request_embeddings(self, batch: List[str]) -> List[np.ndarray]:
+        """Embed one batch of texts with a single API call"""
+        response = self._embed_content(batch)
+        if not hasattr(response, 'embeddings') or len(response.embeddings) != len(batch):
+            raise ValueError(f"Unexpected batch response structure: {response}")
+        return [self._normalize(np.array(item.values, dtype=np.float32)) for item in response.embeddings]
+    
+    def _embed_batch_with_ids(self, texts: List[str], hashes: List[str],
+                              batch_size: int = 100) -> Optional[List[np.ndarray]]:
+        """Batch-embed texts whose hashes the caller already computed"""
         try:
-            # This will hit the LRU cache if available
-            embedding = self._generate_embedding_cached(text_hash, text)
-            if embedding is not None:
-                # Check if it was a cache hit by checking cache info
-                cache_info = self._generate_embedding_cached.cache_info()
-                if cache_info.hits > self.cache_hits:
-                    self.cache_hits = cache_info.hits
-                    logger.debug(f"Cache hit for text: {text[:50]}...")
-                
-                return embedding
+            found: Dict[str, np.ndarray] = {}
+            misses: Dict[str, str] = {}
+            for text_hash, text in zip(hashes, texts):
+                if text_hash in found or text_hash in misses:
+                    continue
+                embedding = self._cache_get(text_hash)
+                if embedding is not None:
+                    found[text_hash] = embedding
+                else:
+                    misses[text_hash] = text
+            
+            # Fan the API calls out over the executor; this thread only merges results
+            miss_hashes = list(misses)
+            batches = [miss_hashes[start:start + batch_size] for start in range(0, len(miss_hashes), batch_size)]
+            contents = [[misses[text_hash] for text_hash in batch_hashes] for batch_hashes in batches]
+            mapper = self._executor.map if len(batches) > 1 else map
+            for batch_hashes, embeddings in zip(batches, mapper(self._request_embeddings, contents)):
+                for text_hash, embedding in zip(batch_hashes, embeddings):
+                    found[text_hash] = self._cache_put(text_hash, embedding)
+            
+            logger.debug("Generated %s embeddings in batches of %s", len(misses), batch_size)
+            return [found[text_hash] for text_hash in hashes]
+            
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
-            logger.error(f"Error in cached embedding generation: {e}")
-        
-        return None
+            logger.error("Error generating batch embeddings: %s", e)
+            return None
     
     def add_document(self, text: str, metadata: Optional[Dict] = None) -> Optional[str]:
         """Add document to Chroma collection"""
         try:
+            # Create document ID, which is also the embedding cache key
+            doc_id = self._create_text_hash(text)
+            
             # Generate embedding
-            embedding = self.generate_embedding(text)
+            embedding = self._embed_with_id(text, doc_id)
             if embedding is None:
                 return None
             
-            # Create document ID
-            doc_id = self._create_text_hash(text)
-            
             # Prepare metadata
             doc_metadata = metadata or {}
             doc_metadata.update({
@@ -140,18 +306,69 @@ class EmbeddingService:
             })
             
             # Add to collection
-            self.collection.add(
-                embeddings=[embedding.tolist()],
+            self._add_to_collection(
+                [doc_id], embedding.reshape(1, -1),
                 documents=[text],
-                metadatas=[doc_metadata],
-                ids=[doc_id]
+                metadatas=[doc_metadata]
             )
             
-            logger.info(f"Added document with ID: {doc_id}")
+            logger.info("Added document with ID: %s", doc_id)
             return doc_id
             
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
-            logger.error(f"Error adding document: {e}")
+            logger.error("Error adding document: %s", e)
+            return None
+    
+    def add_documents(self, texts: List[str], metadatas: Optional[List[Optional[Dict]]] = None,
+                      batch_size: int = 100) -> Optional[List[str]]:
+        """Add many documents with batched embedding calls and a single collection write
+
+        Embedding batches run concurrently on the executor; the collection is
+        written only from the calling thread, once all embeddings are ready.
+        """
+        try:
+            metadatas = metadatas or [None] * len(texts)
+            
+            # Documents are keyed by text hash, so repeated texts collapse to one row
+            rows: Dict[str, tuple] = {}
+            doc_ids = []
+            for text, metadata in zip(texts, metadatas):
+                doc_id = self._create_text_hash(text)
+                doc_ids.append(doc_id)
+                if doc_id not in rows:
+                    rows[doc_id] = (text, metadata)
+            
+            unique_ids = list(rows)
+            unique_texts = [rows[doc_id][0] for doc_id in unique_ids]
+            embeddings = self._embed_batch_with_ids(unique_texts, unique_ids, batch_size)
+            if embeddings is None:
+                return None
+            
+            doc_metadatas = []
+            for text, metadata in rows.values():
+                doc_metadata = metadata or {}
+                doc_metadata.update({
+                    "text_length": len(text),
+                    "text_preview": text[:100] + "..." if len(text) > 100 else text
+                })
+                doc_metadatas.append(doc_metadata)
+            
+            matrix = np.stack(embeddings)
+            self._add_to_collection(
+                unique_ids, matrix,
+                documents=unique_texts,
+                metadatas=doc_metadatas
+            )
+            
+            logger.info("Added %s documents in one batch", len(unique_ids))
+            return doc_ids
+            
+        except ServiceUnavailableError:
+            raise
+        except Exception as e:
+            logger.error("Error adding documents: %s", e)
             return None
     
     def search_similar(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
@@ -162,36 +379,164 @@ class EmbeddingService:
             if query_embedding is None:
                 return []
             
-            # Search in collection
+            formatted_results = self.search_by_embedding(query_embedding, k)
+            logger.info("Search returned %s results for query: %s...", len(formatted_results), query[:50])
+            return formatted_results
+            
+        except ServiceUnavailableError:
+            raise
+        except Exception as e:
+            logger.error("Error in similarity search: %s", e)
+            return []
+    
+    def search_by_embedding(self, query_embedding: np.ndarray, k: int = 5) -> List[Dict[str, Any]]:
+        """Search for documents similar to a precomputed query embedding"""
+        try:
+            query_embedding = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+            mirror = self.mirror
+            if mirror.enabled:
+                return self._search_mirror(mirror, query_embedding, k)
+            
+            if self._doc_count == 0:
+                return []
+            
+            # HNSW is approximate: over-fetch candidates, then re-rank them exactly
             results = self.collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=min(k, self.collection.count())
+                query_embeddings=query_embedding.reshape(1, -1),
+                n_results=min(k * self.rerank_factor, self._doc_count),
+                include=["embeddings", "documents", "metadatas"]
             )
             
-            # Format results
-            formatted_results = []
-            if results['ids'] and len(results['ids'][0]) > 0:
-                for i in range(len(results['ids'][0])):
-                    result = {
-                        "id": results['ids'][0][i],
-                        "text": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i],
-                        "distance": results['distances'][0][i],
-                        "similarity_score": 1 / (1 + results['distances'][0][i])
-                    }
-                    formatted_results.append(result)
+            if not results['ids'] or len(results['ids'][0]) == 0:
+                return []
+            
+            candidates = np.asarray(results['embeddings'][0], dtype=np.float32)
+            dots = candidates @ query_embedding
+            # Same distance Chroma reports for unit vectors in this space
+            distances = 1.0 - dots if self.space == "ip" else 2.0 - 2.0 * dots
+            top = np.argsort(distances)[:k]
             
-            logger.info(f"Search returned {len(formatted_results)} results for query: {query[:50]}...")
-            return formatted_results
+            ids, documents, metadatas = results['ids'][0], results['documents'][0], results['metadatas'][0]
+            return [
+                {
+                    "id": ids[i],
+                    "text": documents[i],
+                    "metadata": metadatas[i],
+                    "distance": float(distances[i]),
+                    "similarity_score": self._similarity(float(distances[i]))
+                }
+                for i in top
+            ]
             
         except Exception as e:
-            logger.error(f"Error in similarity search: {e}")
+            logger.error("Error in similarity search: %s", e)
+            return []
+    
+    def _sync_loop(self):
+        """Periodically catch up with writes made by other processes"""
+        while True:
+            time.sleep(self._sync_interval)
+            try:
+                self._sync_with_collection()
+            except Exception as e:
+                logger.warning("Collection sync failed: %s", e)
+    
+    def _sync_with_collection(self):
+        """Refresh the document count, rebuilding the mirror if it has drifted
+
+        A reset elsewhere deletes the collection this process holds, and adds
+        elsewhere never reach this process's mirror; both show up here as a
+        missing collection or a count that differs from the mirror's. The new
+        mirror is loaded aside and swapped in, so searches keep using the old
+        one meanwhile; only writes from this process wait.
+        """
+        with self._write_lock:
+            count = self._collection_count()
+            
+            # A disabled mirror stays off until the collection fits again
+            mirror = self.mirror
+            if count != mirror.ntotal and (mirror.enabled or count <= mirror.max_size):
+                logger.info("Reloading vector mirror: %s mirrored, %s in collection", mirror.ntotal, count)
+                mirror = VectorMirror(self.dimension, max_size=mirror.max_size, space=self.space)
+                try:
+                    mirror.load(self.collection)
+                except Exception as e:
+                    # Search falls back to querying Chroma until a reload succeeds
+                    logger.warning("Vector mirror reload failed: %s", e)
+                    mirror.disable("reload failed")
+                self.mirror = mirror
+            self._doc_count = count
+    
+    def _collection_count(self) -> int:
+        """collection.count(), reopening the collection if another process reset it"""
+        try:
+            return self.collection.count()
+        except NotFoundError:
+            self._reopen_collection()
+            return self.collection.count()
+    
+    def _reopen_collection(self):
+        """Get a fresh handle after another process reset (deleted and recreated) the collection"""
+        self.collection = self.chroma_client.get_or_create_collection(
+            name=self.collection_name,
+            metadata=COLLECTION_METADATA
+        )
+        self._apply_collection_metadata()
+        self.mirror.space = self.space
+    
+    def _add_to_collection(self, ids: List[str], embeddings: np.ndarray, **records):
+        """Add rows to the collection and the mirror, then refresh the document count
+
+        Reopens the collection once if another process reset it. Chroma ignores
+        IDs it already holds, so the count is re-read rather than incremented.
+        """
+        with self._write_lock:
+            try:
+                self.collection.add(ids=ids, embeddings=embeddings, **records)
+            except NotFoundError:
+                self._reopen_collection()
+                self.collection.add(ids=ids, embeddings=embeddings, **records)
+            self.mirror.add(ids, embeddings)
+            self._doc_count = self._collection_count()
+    
+    def _search_mirror(self, mirror: VectorMirror, query_embedding: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        """Search the in-process mirror, then re-rank its candidates exactly with Chroma's vectors"""
+        candidate_ids, _ = mirror.search(query_embedding, k * self.rerank_factor)
+        if not candidate_ids:
             return []
+        
+        records = self.collection.get(ids=candidate_ids, include=["embeddings", "documents", "metadatas"])
+        if len(records['ids']) == 0:
+            return []
+        
+        candidates = np.asarray(records['embeddings'], dtype=np.float32)
+        dots = candidates @ query_embedding
+        distances = 1.0 - dots if self.space == "ip" else 2.0 - 2.0 * dots
+        top = np.argsort(distances)[:k]
+        
+        ids, documents, metadatas = records['ids'], records['documents'], records['metadatas']
+        return [
+            {
+                "id": ids[i],
+                "text": documents[i],
+                "metadata": metadatas[i],
+                "distance": float(distances[i]),
+                "similarity_score": self._similarity(float(distances[i]))
+            }
+            for i in top
+        ]
+    
+    def get_document_count(self) -> int:
+        """Collection size as last seen by this process, without a Chroma round-trip
+
+        Writes made by other processes show up within sync_interval seconds.
+        """
+        return self._doc_count
     
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection"""
         try:
-            count = self.collection.count()
+            count = self._collection_count()
             return {
                 "collection_name": self.collection_name,
                 "document_count": count,
@@ -199,44 +544,51 @@ class EmbeddingService:
                 "model": self.model_name
             }
         except Exception as e:
-            logger.error(f"Error getting collection info: {e}")
+            logger.error("Error getting collection info: %s", e)
             return {}
     
     def reset_collection(self) -> bool:
         """Reset the collection (delete all documents)"""
         try:
-            # Delete existing collection
-            self.chroma_client.delete_collection(name=self.collection_name)
-            
-            # Create new collection
-            self.collection = self.chroma_client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Document embeddings collection"}
-            )
+            with self._write_lock:
+                # Delete existing collection
+                self.chroma_client.delete_collection(name=self.collection_name)
+                
+                # Create new collection
+                self.collection = self.chroma_client.create_collection(
+                    name=self.collection_name,
+                    metadata=COLLECTION_METADATA
+                )
+                self._apply_collection_metadata()
+                self.mirror.space = self.space
+                self.mirror.reset()
+                self._doc_count = 0
             
-            logger.info(f"Collection {self.collection_name} reset successfully")
+            logger.info("Collection %s reset successfully", self.collection_name)
             return True
             
         except Exception as e:
-            logger.error(f"Error resetting collection: {e}")
+            logger.error("Error resetting collection: %s", e)
             return False
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        cache_info = self._generate_embedding_cached.cache_info()
-        return {
-            "cache_hits": cache_info.hits,
-            "cache_misses": cache_info.misses,
-            "cache_size": cache_info.currsize,
-            "cache_maxsize": cache_info.maxsize,
-            "hit_rate": cache_info.hits / (cache_info.hits + cache_info.misses) if (cache_info.hits + cache_info.misses) > 0 else 0
-        }
+        with self._cache_lock:
+            hits, misses = self.cache_hits, self.cache_misses
+            return {
+                "cache_hits": hits,
+                "cache_misses": misses,
+                "cache_size": len(self._cache),
+                "cache_maxsize": self.cache_size,
+                "hit_rate": hits / (hits + misses) if (hits + misses) > 0 else 0
+            }
     
     def clear_cache(self):
         """Clear the LRU cache"""
-        self._generate_embedding_cached.cache_clear()
-        self.cache_hits = 0
-        self.cache_misses = 0
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
         logger.info("Cache cleared successfully")
     
     def test_connection(self) -> Dict[str, bool]:
@@ -248,7 +600,7 @@ class EmbeddingService:
             test_embedding = self.generate_embedding("test connection")
             results["gemini"] = test_embedding is not None
         except Exception as e:
-            logger.error(f"Gemini API test failed: {e}")
+            logger.error("Gemini API test failed: %s", e)
             results["gemini"] = False
         
         # Test Chroma DB
@@ -256,7 +608,7 @@ class EmbeddingService:
             count = self.collection.count()
             results["chroma"] = True
         except Exception as e:
-            logger.error(f"Chroma DB test failed: {e}")
+            logger.error("Chroma DB test failed: %s", e)
             results["chroma"] = False
         
         return results
\ No newline at end of file
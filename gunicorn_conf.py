@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for the Embedding Service
+
+Usage:
+    gunicorn 'app:create_app()' -c gunicorn_conf.py
+
+    # Cooperative I/O: hundreds of in-flight Gemini calls per worker
+    GUNICORN_WORKER_CLASS=gevent gunicorn 'app:create_app()' -c gunicorn_conf.py
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8081')
+
+# Requests spend most of their time waiting on Gemini and Chroma, so each
+# worker runs several threads
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Concurrent greenlets per worker for the gevent/eventlet worker classes.
+# Those workers monkey-patch the stdlib themselves before loading the app,
+# so app.py does not patch anything and still runs under gthread.
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+if worker_class in ('gevent', 'eventlet'):
+    workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+
+# Each worker owns a PDF extraction process pool; workers inherit this
+# environment, so config.py splits the cores between them instead of every
+# worker starting cpu_count extraction processes
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# PDF uploads can take a while to extract and embed
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+# Preloading initializes the services once in the master and shares their
+# memory with workers, but the Chroma client's SQLite connection is then
+# inherited across fork, which SQLite does not support. Opt in only with a
+# client/server Chroma deployment.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
@@ -0,0 +1,127 @@
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    result BLOB,
+    error TEXT,
+    expires_at REAL
+)
+"""
+
+
+class JobError(Exception):
+    """Job failure carrying the HTTP status a synchronous caller should return"""
+
+    def __init__(self, message: str, status_code: int = 500, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Background job runner with status shared between server processes
+
+    Jobs run on a thread pool in the process that accepted them, and their
+    status is kept in a SQLite file for ttl seconds after they finish, so any
+    worker on the host can answer a status lookup. A job still unfinished
+    when its process exits (e.g. a worker recycled by max_requests) is
+    reported as failed so the client can resubmit it.
+    """
+
+    def __init__(self, path: str, max_workers: int = 2, ttl: float = 3600.0):
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived autocommit connection per call: connections must not cross threads
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, fn: Callable[..., Dict[str, Any]], *args) -> str:
+        """Queue fn(*args) and return its job ID"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+            conn.execute("INSERT INTO jobs (job_id, status, owner_pid) VALUES (?, 'queued', ?)",
+                         (job_id, os.getpid()))
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job's status record, or None if unknown or expired"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, owner_pid, result, error, expires_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        status, owner_pid, result, error, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+
+        if status in ("queued", "processing") and not _pid_alive(owner_pid):
+            self._update(job_id, status="failed",
+                         error="Server worker restarted before the job finished; please resubmit")
+            return self.get(job_id)
+
+        job = {"job_id": job_id, "status": status}
+        if result is not None:
+            job["result"] = orjson.loads(result)
+        if error is not None:
+            job["error"] = error
+        return job
+
+    def _run(self, job_id: str, fn: Callable[..., Dict[str, Any]], args: tuple):
+        self._update(job_id, status="processing")
+        try:
+            result = fn(*args)
+            self._update(job_id, status="completed", result=result)
+        except JobError as e:
+            self._update(job_id, status="failed", error=e.message)
+        except Exception as e:
+            logger.error("Job %s failed: %s", job_id, e)
+            self._update(job_id, status="failed", error="Internal server error")
+
+    def _update(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                error: Optional[str] = None):
+        expires_at = time.time() + self.ttl if status in ("completed", "failed") else None
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, expires_at = ? WHERE job_id = ?",
+                (status, orjson.dumps(result) if result is not None else None, error, expires_at, job_id)
+            )
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceUnavailableError(Exception):
+    """Upstream call refused locally; clients should retry after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures
+
+    After fail_max consecutive failures the circuit opens and calls are
+    refused for reset_timeout seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure reopens it,
+    and a neutral outcome (one that says nothing about upstream health)
+    frees the trial slot without changing the state.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def before_call(self):
+        """Raise ServiceUnavailableError if the call should not be attempted"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == self.OPEN and remaining <= 0:
+                self._transition(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+        raise ServiceUnavailableError(f"{self.name} circuit is open", max(remaining, 1.0))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_neutral(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                    self._transition(self.OPEN)
+
+    def _transition(self, state: str):
+        logger.warning("%s circuit %s -> %s", self.name, self._state, state)
+        self._state = state
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened
+            }
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Take one token, waiting at most timeout seconds; False if none became available"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
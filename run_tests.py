@@ -6,25 +6,34 @@ Provides both pytest and direct async execution options
 
 import sys
 import subprocess
-import asyncio
 import os
+import socket
 
 def run_with_pytest():
-    """Run tests using pytest"""
+    """Run tests using pytest, in parallel across CPU cores with pytest-xdist"""
     print("🧪 Running tests with pytest...")
     print("=" * 50)
     
+    pytest_cmd = [
+        sys.executable, "-m", "pytest", 
+        "tests.py", 
+        "-v", 
+        "--tb=short",
+        "--asyncio-mode=auto"
+    ]
+    
     try:
-        # Run pytest with verbose output
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", 
-            "tests.py", 
-            "-v", 
-            "--tb=short",
-            "--asyncio-mode=auto"
+        # Dependent tests share an xdist_group so they stay on one worker, in order
+        parallel = subprocess.run(pytest_cmd + [
+            "-n", "auto",
+            "--dist", "loadgroup",
+            "-m", "not serial"
         ], check=False)
         
-        return result.returncode == 0
+        # Tests that would disturb concurrent ones (e.g. the request burst) run alone
+        serial = subprocess.run(pytest_cmd + ["-m", "serial"], check=False)
+        
+        return parallel.returncode == 0 and serial.returncode == 0
     except Exception as e:
         print(f"❌ Error running pytest: {e}")
         return False
@@ -36,8 +45,8 @@ def run_direct_async():
     
     try:
         # Import and run the async test function
-        from tests import run_all_tests
-        result = asyncio.run(run_all_tests())
+        from tests import run_all_tests_sync
+        result = run_all_tests_sync()
         return result
     except Exception as e:
         print(f"❌ Error running async tests: {e}")
@@ -45,8 +54,24 @@ def run_direct_async():
         traceback.print_exc()
         return False
 
-def check_server():
-    """Check if the API server is running"""
+def check_server(strict=False):
+    """Check if the API server is running
+
+    By default this is a TCP connect to the server port; with strict=True
+    it also requires GET /health/ to return 200 (i.e. warmup finished).
+    """
+    try:
+        with socket.create_connection(("localhost", 8081), timeout=1):
+            pass
+    except OSError as e:
+        print(f"❌ API server is not accessible: {e}")
+        print("💡 Make sure to start the server: python app.py")
+        return False
+
+    if not strict:
+        print("✅ API server is running")
+        return True
+
     import httpx
     
     try:
@@ -69,13 +94,13 @@ def main():
     print("=" * 50)
     
     # Check if server is running
-    if not check_server():
+    if not check_server(strict="--strict" in sys.argv):
         print("\n❌ Cannot run tests without API server")
         print("📋 Start the server first: python app.py")
         return False
     
     # Determine test method
-    if len(sys.argv) > 1 and sys.argv[1] == "--direct":
+    if "--direct" in sys.argv:
         success = run_direct_async()
     else:
         success = run_with_pytest()
@@ -92,6 +117,7 @@ if __name__ == "__main__":
     print("Usage:")
     print("  python run_tests.py          # Run with pytest")
     print("  python run_tests.py --direct # Run directly with asyncio")
+    print("  python run_tests.py --strict # Also require /health/ to report ready")
     print()
     
     success = main()
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Two-stage cache for query embeddings and search results
+
+    Stage 1 maps an exact-text SHA-256 to its embedding (LRU with TTL).
+    Stage 2 keeps the embeddings of recent search queries in a flat
+    inner-product index so a near-duplicate query can reuse a prior result;
+    its exact-match lookup folds case and surrounding whitespace.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600.0,
+                 threshold: float = 0.97, search_slots: int = 256):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.search_slots = search_slots
+        self._lock = threading.Lock()
+
+        # Stage 1: text hash -> (expires_at, embedding)
+        self._embeddings: "OrderedDict[bytes, Tuple[float, np.ndarray]]" = OrderedDict()
+
+        # Stage 2: fixed ring of recent searches, one row per slot
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_k = np.zeros(search_slots, dtype=np.int32)
+        self._slot_expiry = np.zeros(search_slots, dtype=np.float64)
+        self._slot_keys: List[Optional[Tuple[bytes, int]]] = [None] * search_slots
+        self._slot_results: List[Optional[List[Dict[str, Any]]]] = [None] * search_slots
+        self._search_index: Dict[Tuple[bytes, int], int] = {}
+        self._next_slot = 0
+        self._collection_size: Optional[int] = None
+
+        # Statistics
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+        self.search_exact_hits = 0
+        self.search_similar_hits = 0
+        self.search_misses = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        """Hash text exactly as given"""
+        return hashlib.sha256(text.encode('utf-8')).digest()
+
+    @classmethod
+    def _search_key(cls, query: str) -> bytes:
+        """Hash case- and whitespace-folded query text"""
+        return cls._key(query.strip().lower())
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        return vec / (np.linalg.norm(vec) + 1e-12)
+
+    def get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for text, if any"""
+        key = self._key(text)
+        with self._lock:
+            entry = self._embeddings.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._embeddings.move_to_end(key)
+                self.embedding_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._embeddings[key]
+            self.embedding_misses += 1
+            return None
+
+    def put_embedding(self, text: str, embedding: np.ndarray):
+        """Cache the embedding for text"""
+        key = self._key(text)
+        with self._lock:
+            self._embeddings[key] = (time.monotonic() + self.ttl, embedding)
+            self._embeddings.move_to_end(key)
+            if len(self._embeddings) > self.maxsize:
+                self._embeddings.popitem(last=False)
+
+    def get_search(self, query: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for an identical (case-folded) query"""
+        with self._lock:
+            slot = self._search_index.get((self._search_key(query), k))
+            if slot is not None and self._slot_expiry[slot] > time.monotonic():
+                self.search_exact_hits += 1
+                return self._slot_results[slot]
+            return None
+
+    def get_similar_search(self, query_embedding: np.ndarray, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Return results of the most similar recent query above threshold"""
+        with self._lock:
+            if self._vectors is None:
+                self.search_misses += 1
+                return None
+
+            scores = self._vectors @ self._normalize(query_embedding)
+            valid = (self._slot_k == k) & (self._slot_expiry > time.monotonic())
+            scores[~valid] = -np.inf
+
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                self.search_similar_hits += 1
+                return self._slot_results[best]
+
+            self.search_misses += 1
+            return None
+
+    def put_search(self, query: str, query_embedding: np.ndarray, k: int,
+                   results: List[Dict[str, Any]]):
+        """Cache search results for query"""
+        key = (self._search_key(query), k)
+        vec = self._normalize(query_embedding)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.search_slots, vec.shape[0]), dtype=np.float32)
+
+            slot = self._search_index.get(key)
+            if slot is None:
+                slot = self._next_slot
+                self._next_slot = (self._next_slot + 1) % self.search_slots
+                evicted = self._slot_keys[slot]
+                if evicted is not None:
+                    del self._search_index[evicted]
+                self._search_index[key] = slot
+
+            self._vectors[slot] = vec
+            self._slot_k[slot] = k
+            self._slot_expiry[slot] = time.monotonic() + self.ttl
+            self._slot_keys[slot] = key
+            self._slot_results[slot] = results
+
+    def invalidate_search(self):
+        """Drop cached search results (call after the collection changes)"""
+        with self._lock:
+            self._invalidate_search_locked()
+
+    def sync_collection_size(self, count: int):
+        """Drop cached search results if the collection size changed since the last call
+
+        Other server processes add and reset documents without reaching this
+        process's invalidate_search(), so call this with the embedding
+        service's document count before each lookup.
+        """
+        with self._lock:
+            if count != self._collection_size:
+                self._collection_size = count
+                self._invalidate_search_locked()
+
+    def _invalidate_search_locked(self):
+        self._slot_k[:] = 0
+        self._slot_expiry[:] = 0
+        self._slot_keys = [None] * self.search_slots
+        self._slot_results = [None] * self.search_slots
+        self._search_index.clear()
+        self._next_slot = 0
+
+    def clear(self):
+        """Clear both cache stages and reset statistics"""
+        self.invalidate_search()
+        with self._lock:
+            self._embeddings.clear()
+            self.embedding_hits = 0
+            self.embedding_misses = 0
+            self.search_exact_hits = 0
+            self.search_similar_hits = 0
+            self.search_misses = 0
+        logger.info("Semantic cache cleared successfully")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics"""
+        with self._lock:
+            search_hits = self.search_exact_hits + self.search_similar_hits
+            search_total = search_hits + self.search_misses
+            embedding_total = self.embedding_hits + self.embedding_misses
+            return {
+                "embedding_hits": self.embedding_hits,
+                "embedding_misses": self.embedding_misses,
+                "embedding_cache_size": len(self._embeddings),
+                "search_exact_hits": self.search_exact_hits,
+                "search_similar_hits": self.search_similar_hits,
+                "search_misses": self.search_misses,
+                "search_cache_size": len(self._search_index),
+                "similarity_threshold": self.threshold,
+                "hit_rate": (self.embedding_hits + search_hits) / (embedding_total + search_total)
+                            if (embedding_total + search_total) > 0 else 0
+            }
@@ -0,0 +1,61 @@
+"""Shared constants and helpers for the API tests (tests.py and conftest.py)"""
+
+import asyncio
+import os
+from typing import List
+
+import httpx
+import orjson
+
+# Point at an https:// proxy in front of the server to exercise HTTP/2
+BASE_URL = os.getenv("TEST_BASE_URL", "http://localhost:8081/api/v1")
+
+# Endpoint paths, relative to BASE_URL
+HEALTH_PATH = "/health/"
+READY_PATH = "/health/ready"
+EMBED_PATH = "/embed/"
+EMBED_BATCH_PATH = "/embed/batch"
+TEXT_DOCUMENTS_PATH = "/documents/text"
+LEGACY_DOCUMENTS_PATH = "/documents/"
+PDF_DOCUMENTS_PATH = "/documents/pdf"
+PDF_JOBS_PATH = "/documents/jobs/"
+SEARCH_PATH = "/search/"
+COLLECTION_INFO_PATH = "/collection/info"
+COLLECTION_RESET_PATH = "/collection/reset"
+CACHE_STATS_PATH = "/cache/stats"
+CACHE_CLEAR_PATH = "/cache/clear"
+
+
+def create_client() -> httpx.AsyncClient:
+    """Client shared by a whole test run so connections are kept alive between tests
+
+    HTTP/2 is negotiated via TLS ALPN, so concurrent requests multiplex over
+    one connection only for https:// URLs; plain http:// stays on pooled
+    HTTP/1.1 connections (Flask and gunicorn do not speak cleartext HTTP/2).
+    """
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+
+
+# Added once per run and shared by the tests that need documents to exist
+SEED_DOCUMENTS = [
+    {
+        "text": "The old lighthouse keeper maintained the beacon that guided sailors through dangerous waters.",
+        "metadata": {"category": "maritime", "test_type": "search_test"}
+    },
+    {
+        "text": "Document to be deleted during reset test.",
+        "metadata": {"test_type": "reset_test"}
+    }
+]
+
+
+async def seed_documents(client: httpx.AsyncClient) -> List[str]:
+    """Add SEED_DOCUMENTS concurrently and return their document IDs"""
+    responses = await asyncio.gather(*(client.post(TEXT_DOCUMENTS_PATH, json=doc) for doc in SEED_DOCUMENTS))
+    for response in responses:
+        assert response.status_code == 201
+    return [orjson.loads(response.content)["document_id"] for response in responses]
@@ -1,12 +1,21 @@
 import unittest
-import requests
-import json
+import asyncio
+import atexit
+import functools
+import httpx
+import orjson
 import time
 import os
+import random
+import hashlib
+import shutil
 import tempfile
 import io
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, List, Tuple
 import numpy as np
+import pytest
+from pydantic import TypeAdapter, ValidationError
 
 # Fix for SQLite3 compatibility with ChromaDB
 try:
@@ -21,6 +30,98 @@ from embedding_service import EmbeddingService
 from pdf_extractor import PDFExtractor
 from config import Config
 
+# Tests that must not overlap with others: exact document counts and cache clearing.
+# Under pytest-xdist, run the rest with -m "not serial" and these with -m serial
+SERIAL = pytest.mark.serial
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Validates a whole embedding in one call; strict, so numeric strings and bools are rejected
+_EMBEDDING_ADAPTER = TypeAdapter(List[float])
+
+# Successful /health/ responses by URL, as (fetched at, JSON body)
+_HEALTH_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+async def cached_health(fetch, url: str, ttl: float = 60, **kwargs) -> Tuple[int, Dict[str, Any]]:
+    """GET a health endpoint with fetch, reusing the last 200 response for ttl seconds
+
+    fetch(method, url, **kwargs) returns (status, JSON body). Pass ttl=0 to always ask the server, e.g. when re-checking after a change.
+    """
+    cached = _HEALTH_CACHE.get(url)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return 200, cached[1]
+    
+    status, data = await fetch("GET", url, **kwargs)
+    if status == 200:
+        _HEALTH_CACHE[url] = (time.monotonic(), data)
+    return status, data
+
+
+def _fingerprint(embedding) -> bytes:
+    """16-byte digest of an embedding's float32 bytes, for cheap bitwise comparison"""
+    return hashlib.blake2b(np.asarray(embedding, dtype=np.float32).tobytes(), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=1)
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService, built on first use and shared by every test class
+
+    It persists to its own temporary directory rather than ./chroma_db, which
+    the running server already has open: Chroma does not support several
+    processes (the server plus each pytest-xdist worker) writing one directory.
+    """
+    persist_path = tempfile.mkdtemp(prefix="embedding-unit-")
+    atexit.register(shutil.rmtree, persist_path, ignore_errors=True)
+    return EmbeddingService(persist_path=persist_path)
+
+
+@functools.lru_cache(maxsize=1)
+def get_pdf_extractor() -> PDFExtractor:
+    """Process-wide PDFExtractor, built on first use and shared by every test class"""
+    return PDFExtractor()
+
+
+def reset_for_tests():
+    """Drop the shared instances so the next getter call builds fresh ones"""
+    get_embedding_service.cache_clear()
+    get_pdf_extractor.cache_clear()
+
+
+class CollectionInfoClient:
+    """Memoizes /collection/info responses until the collection is changed
+
+    Responses are keyed by the document count the caller expects (None for
+    "whatever it is now"); tests that add documents call invalidate(). A
+    response whose count differs from the expected one is returned but not
+    cached, so a read that raced a write is fetched again next time.
+    """
+    
+    def __init__(self, fetch):
+        self._fetch = fetch
+        self._cache: Dict[Any, Dict[str, Any]] = {}
+    
+    async def get_info(self, expected_count=None) -> Tuple[int, Dict[str, Any]]:
+        if expected_count in self._cache:
+            return 200, self._cache[expected_count]
+        
+        status, info = await self._fetch("GET", "/collection/info")
+        if status == 200 and expected_count in (None, info.get('document_count')):
+            self._cache[expected_count] = info
+        return status, info
+    
+    def invalidate(self):
+        self._cache.clear()
+
+
+def async_test(test):
+    """Run an async test method to completion on the class event loop"""
+    @functools.wraps(test)
+    def wrapper(self, *args, **kwargs):
+        return self._run_async(test(self, *args, **kwargs))
+    return wrapper
+
+
 class TestEmbeddingService(unittest.TestCase):
     """Comprehensive unit tests for the embedding service"""
     
@@ -28,64 +129,157 @@ class TestEmbeddingService(unittest.TestCase):
     def setUpClass(cls):
         """Set up test environment"""
         cls.base_url = "http://127.0.0.1:8081/api/v1"
-        cls.embedding_service = EmbeddingService()
-        cls.pdf_extractor = PDFExtractor()
+        cls.pdf_extractor = get_pdf_extractor()
         cls.sample_text = "The lighthouse keeper watched over ships in the stormy night."
         cls.sample_query = "lighthouse and sea stories"
-        
-        # Wait for API to be ready
-        print("\n🔧 Setting up test environment...")
-        cls._wait_for_api()
+        cls.TEST_PDF_BYTES = cls._create_test_pdf_content()
+        
+        # One event loop and keep-alive connection pool shared by every test
+        cls.loop = asyncio.new_event_loop()
+        cls.session = httpx.AsyncClient(
+            base_url=cls.base_url,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=16)
+        )
+        cls.collection = CollectionInfoClient(cls._fetch)
+        # Caps concurrent calls that can reach Gemini, below the point where it rate limits
+        cls.sem = asyncio.Semaphore(8)
+        
+        # Progress messages are buffered and written out once per test
+        cls._log_buf = io.StringIO()
+        cls._log("\n🔧 Setting up test environment...")
+        try:
+            cls._run_async(cls._prepare())
+        finally:
+            cls._flush_log()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared HTTP session and event loop"""
+        cls._run_async(cls.session.aclose())
+        cls.loop.close()
+        cls._flush_log()
+    
+    def tearDown(self):
+        self._flush_log()
+    
+    @classmethod
+    def _log(cls, message: str):
+        cls._log_buf.write(message + "\n")
+    
+    @classmethod
+    def _flush_log(cls):
+        """Write buffered progress messages to stdout in a single call"""
+        sys.stdout.write(cls._log_buf.getvalue())
+        sys.stdout.flush()
+        cls._log_buf.seek(0)
+        cls._log_buf.truncate()
+    
+    @classmethod
+    def _run_async(cls, coro):
+        """Run a coroutine on the class event loop"""
+        return cls.loop.run_until_complete(coro)
+    
+    @classmethod
+    async def _fetch(cls, method: str, path: str, **kwargs):
+        """Send a request on the shared session and return (status, JSON body)"""
+        if 'json' in kwargs:
+            # Serialize with orjson rather than letting httpx use the stdlib encoder
+            kwargs['content'] = orjson.dumps(kwargs.pop('json'))
+            kwargs['headers'] = JSON_HEADERS
+        async with cls.sem:
+            response = await cls.session.request(method, path, **kwargs)
+        return response.status_code, orjson.loads(response.content)
+    
+    @classmethod
+    async def _to_thread(cls, func, *args):
+        """Run a blocking direct service call in a worker thread, within the concurrency cap"""
+        async with cls.sem:
+            return await asyncio.to_thread(func, *args)
+    
+    @classmethod
+    async def _prepare(cls):
+        """Build the direct service while waiting for the API, then load fixtures"""
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(cls._await_api())
+            tg.create_task(cls._create_embedding_service())
+        await cls._load_fixtures()
+    
+    @classmethod
+    async def _create_embedding_service(cls):
+        # The first call connects to Gemini and opens Chroma, so it runs off the event loop
+        cls.embedding_service = await asyncio.to_thread(get_embedding_service)
+    
+    @classmethod
+    async def _load_fixtures(cls):
+        """Ingest and embed the sample text once for the tests that only read them"""
+        sample_doc = {
+            "text": cls.sample_text,
+            "metadata": {"source": "unit_test", "test_type": "fixture"}
+        }
+        (doc_status, doc_result), (embed_status, embed_result) = await asyncio.gather(
+            cls._fetch("POST", "/documents/text", json=sample_doc),
+            cls._fetch("POST", "/embed/", json={"text": cls.sample_text})
+        )
+        if doc_status != 201 or embed_status != 200:
+            raise RuntimeError(f"Fixture setup failed: {doc_result if doc_status != 201 else embed_result}")
+        
+        cls.sample_doc_id = doc_result['document_id']
+        cls.sample_embed_result = embed_result
     
     @classmethod
-    def _wait_for_api(cls, timeout=30):
-        """Wait for API server to be ready"""
+    async def _await_api(cls, timeout=30):
+        """Wait for API server to be listening and warmed up"""
         start_time = time.time()
-        while time.time() - start_time < timeout:
+        attempt = 0
+        while (remaining := timeout - (time.time() - start_time)) > 0:
             try:
-                response = requests.get(f"{cls.base_url}/health/", timeout=2)
+                # Held open server-side until warmup finishes, so one call suffices once listening
+                response = await cls.session.get("/health/ready", params={"timeout": remaining}, timeout=remaining + 2)
                 if response.status_code == 200:
-                    print("✅ API server is ready")
+                    cls._log("✅ API server is ready")
                     return
-            except requests.exceptions.RequestException:
+            except httpx.HTTPError:
                 pass
-            time.sleep(1)
+            # Not listening yet: 0.05 s, 0.1 s, 0.2 s, ... capped at 2 s, with jitter
+            await asyncio.sleep(min(2.0, 0.05 * (2 ** attempt)) + random.uniform(0, 0.05))
+            attempt += 1
         
         raise RuntimeError("API server not available. Please start: python app.py")
     
-    def test_01_api_key_validation(self):
+    @async_test
+    async def test_01_api_key_validation(self):
         """Test Case 1: Validate API keys and connections"""
-        print("\n🔑 Testing API Key Validation...")
+        self._log("\n🔑 Testing API Key Validation...")
         
         # Test Gemini API key configuration
         self.assertIsNotNone(os.getenv('GEMINI_API_KEY'), "GEMINI_API_KEY not configured")
         
-        # Test service connection through health endpoint
-        response = requests.get(f"{self.base_url}/health/")
-        self.assertEqual(response.status_code, 200)
+        # Test service connection through health endpoint, alongside the direct service connection
+        (status, health_data), test_result = await asyncio.gather(
+            cached_health(self._fetch, f"{self.base_url}/health/"),
+            self._to_thread(self.embedding_service.test_connection)
+        )
+        self.assertEqual(status, 200)
         
-        health_data = response.json()
         self.assertEqual(health_data['status'], 'healthy')
         self.assertTrue(health_data['services']['gemini_api'], "Gemini API connection failed")
         self.assertTrue(health_data['services']['chroma_db'], "Chroma DB connection failed")
         
-        # Test direct service connection
-        test_result = self.embedding_service.test_connection()
+        # Validate direct service connection
         self.assertTrue(test_result.get('gemini', False), "Direct Gemini connection failed")
         self.assertTrue(test_result.get('chroma', False), "Direct Chroma connection failed")
         
-        print("✅ API key validation passed")
+        self._log("✅ API key validation passed")
     
-    def test_02_gemini_embedding_response(self):
+    @async_test
+    async def test_02_gemini_embedding_response(self):
         """Test Case 2: Validate Gemini embedding response"""
-        print("\n🧠 Testing Gemini Embedding Response...")
+        self._log("\n🧠 Testing Gemini Embedding Response...")
         
-        # Test embedding generation via API
-        embed_data = {"text": self.sample_text}
-        response = requests.post(f"{self.base_url}/embed/", json=embed_data)
-        
-        self.assertEqual(response.status_code, 200)
-        result = response.json()
+        # Embedding generated via API in setUpClass
+        result = self.sample_embed_result
         
         # Validate response structure
         self.assertIn('text', result)
@@ -98,26 +292,35 @@ class TestEmbeddingService(unittest.TestCase):
         self.assertGreater(len(embedding), 0, "Embedding should not be empty")
         self.assertEqual(len(embedding), result['dimension'], "Dimension mismatch")
         
-        # Check if all values are floats
-        for value in embedding[:5]:  # Check first 5 values
-            self.assertIsInstance(value, (int, float), "Embedding values should be numeric")
+        # Check that all values are numeric
+        try:
+            _EMBEDDING_ADAPTER.validate_python(embedding, strict=True)
+        except ValidationError as e:
+            self.fail(f"Embedding values should be numeric: {e}")
         
         # Test direct service method
-        direct_embedding = self.embedding_service.generate_embedding(self.sample_text)
+        direct_embedding = await self._to_thread(self.embedding_service.generate_embedding, self.sample_text)
         self.assertIsNotNone(direct_embedding, "Direct embedding generation failed")
         self.assertIsInstance(direct_embedding, np.ndarray, "Direct embedding should be numpy array")
         
-        print(f"✅ Gemini embedding response validated (dimension: {result['dimension']})")
+        # The repeat call is served from the LRU cache and must match bit for bit
+        cached_embedding = await self._to_thread(self.embedding_service.generate_embedding, self.sample_text)
+        self.assertEqual(_fingerprint(direct_embedding), _fingerprint(cached_embedding))
+        
+        self._log(f"✅ Gemini embedding response validated (dimension: {result['dimension']})")
     
-    def test_03_chroma_setup_validation(self):
+    @async_test
+    async def test_03_chroma_setup_validation(self):
         """Test Case 3: Validate Chroma setup and configuration"""
-        print("\n🗄️ Testing Chroma Setup Validation...")
+        self._log("\n🗄️ Testing Chroma Setup Validation...")
         
-        # Test collection info via API
-        response = requests.get(f"{self.base_url}/collection/info")
-        self.assertEqual(response.status_code, 200)
+        # Test collection info via API, alongside direct service collection access
+        (status, collection_info), info = await asyncio.gather(
+            self.collection.get_info(),
+            self._to_thread(self.embedding_service.get_collection_info)
+        )
+        self.assertEqual(status, 200)
         
-        collection_info = response.json()
         self.assertIn('collection_name', collection_info)
         self.assertIn('document_count', collection_info)
         self.assertIn('embedding_dimension', collection_info)
@@ -127,18 +330,14 @@ class TestEmbeddingService(unittest.TestCase):
         self.assertEqual(collection_info['model'], 'gemini-embedding-001')
         self.assertGreaterEqual(collection_info['document_count'], 0)
         
-        # Test direct service collection access
-        info = self.embedding_service.get_collection_info()
+        # Validate direct service collection access
         self.assertIsInstance(info, dict, "Collection info should be a dictionary")
         self.assertIn('collection_name', info)
         
-        print(f"✅ Chroma setup validated (collection: {collection_info['collection_name']})")
+        self._log(f"✅ Chroma setup validated (collection: {collection_info['collection_name']})")
     
-    def test_04_document_ingestion_text(self):
-        """Test Case 4a: Test text document ingestion"""
-        print("\n📝 Testing Text Document Ingestion...")
-        
-        # Test text document upload
+    async def _ingest_text(self):
+        """Upload the sample text as a document"""
         text_data = {
             "text": self.sample_text,
             "metadata": {
@@ -147,36 +346,48 @@ class TestEmbeddingService(unittest.TestCase):
                 "test_type": "text_ingestion"
             }
         }
+        try:
+            return await self._fetch("POST", "/documents/text", json=text_data)
+        finally:
+            self.collection.invalidate()
+    
+    async def _ingest_pdf(self):
+        """Upload the sample PDF as a document"""
+        files = {'file': ('test_document.pdf', io.BytesIO(self.TEST_PDF_BYTES), 'application/pdf')}
+        data = {'metadata': orjson.dumps({"category": "test_pdf", "source": "unit_test"}).decode()}
+        try:
+            return await self._fetch("POST", "/documents/pdf", files=files, data=data)
+        finally:
+            self.collection.invalidate()
+    
+    @async_test
+    async def test_04_document_ingestion(self):
+        """Test Case 4: Test text and PDF document ingestion"""
+        self._log("\n📝 Testing Text and PDF Document Ingestion...")
+        
+        # The two uploads are independent, so send them together; return_exceptions
+        # lets both finish before either failure is reported
+        text_response, pdf_response = await asyncio.gather(
+            self._ingest_text(), self._ingest_pdf(), return_exceptions=True
+        )
+        for response in (text_response, pdf_response):
+            if isinstance(response, BaseException):
+                raise response
+        
+        # Validate text ingestion
+        status, result = text_response
+        self.assertEqual(status, 201)
         
-        response = requests.post(f"{self.base_url}/documents/text", json=text_data)
-        self.assertEqual(response.status_code, 201)
-        
-        result = response.json()
         self.assertIn('document_id', result)
         self.assertIn('message', result)
         self.assertEqual(result['text'], self.sample_text)
         self.assertEqual(result['metadata']['source_type'], 'text')
+        text_doc_id = result['document_id']
         
-        # Store document ID for later tests
-        self.text_doc_id = result['document_id']
-        
-        print(f"✅ Text document ingested successfully (ID: {self.text_doc_id})")
-    
-    def test_04_document_ingestion_pdf(self):
-        """Test Case 4b: Test PDF document ingestion"""
-        print("\n📄 Testing PDF Document Ingestion...")
+        # Validate PDF ingestion
+        status, result = pdf_response
+        self.assertEqual(status, 201)
         
-        # Create a simple test PDF content
-        pdf_content = self._create_test_pdf_content()
-        
-        # Test PDF upload
-        files = {'file': ('test_document.pdf', io.BytesIO(pdf_content), 'application/pdf')}
-        data = {'metadata': json.dumps({"category": "test_pdf", "source": "unit_test"})}
-        
-        response = requests.post(f"{self.base_url}/documents/pdf", files=files, data=data)
-        self.assertEqual(response.status_code, 201)
-        
-        result = response.json()
         self.assertIn('document_id', result)
         self.assertIn('message', result)
         self.assertIn('extraction_info', result)
@@ -186,15 +397,14 @@ class TestEmbeddingService(unittest.TestCase):
         self.assertIn('pages_processed', extraction_info)
         self.assertIn('total_characters', extraction_info)
         self.assertIn('total_words', extraction_info)
+        pdf_doc_id = result['document_id']
         
-        # Store document ID for later tests
-        self.pdf_doc_id = result['document_id']
-        
-        print(f"✅ PDF document ingested successfully (ID: {self.pdf_doc_id})")
+        self._log(f"✅ Documents ingested successfully (text ID: {text_doc_id}, PDF ID: {pdf_doc_id})")
     
-    def test_05_search_retrieval(self):
+    @async_test
+    async def test_05_search_retrieval(self):
         """Test Case 5: Test search retrieval functionality"""
-        print("\n🔍 Testing Search Retrieval...")
+        self._log("\n🔍 Testing Search Retrieval...")
         
         # Test similarity search
         search_data = {
@@ -202,10 +412,13 @@ class TestEmbeddingService(unittest.TestCase):
             "k": 3
         }
         
-        response = requests.post(f"{self.base_url}/search/", json=search_data)
-        self.assertEqual(response.status_code, 200)
+        # API and direct service searches are independent, so run them together
+        (status, search_result), direct_results = await asyncio.gather(
+            self._fetch("POST", "/search/", json=search_data),
+            self._to_thread(self.embedding_service.search_similar, self.sample_query, 2)
+        )
+        self.assertEqual(status, 200)
         
-        search_result = response.json()
         self.assertIn('query', search_result)
         self.assertIn('results', search_result)
         self.assertIn('count', search_result)
@@ -219,25 +432,26 @@ class TestEmbeddingService(unittest.TestCase):
             self.assertIn('distance', result)
             self.assertIn('similarity_score', result)
             
-            # Validate similarity score range (0-1)
-            self.assertGreaterEqual(result['similarity_score'], 0)
-            self.assertLessEqual(result['similarity_score'], 1)
+            # Validate similarity score range (0-1) for every result, as one array
+            results = search_result['results']
+            scores = np.fromiter((r['similarity_score'] for r in results), dtype=np.float64, count=len(results))
+            self.assertTrue(((scores >= 0) & (scores <= 1)).all(), f"Similarity scores out of range: {scores}")
         
-        # Test direct service search
-        direct_results = self.embedding_service.search_similar(self.sample_query, 2)
+        # Validate direct service search
         self.assertIsInstance(direct_results, list, "Direct search should return a list")
         
-        print(f"✅ Search retrieval validated (found {search_result['count']} results)")
+        self._log(f"✅ Search retrieval validated (found {search_result['count']} results)")
     
-    def test_06_chroma_index_storage(self):
+    @SERIAL
+    @async_test
+    async def test_06_chroma_index_storage(self):
         """Test Case 6: Test Chroma index storage and persistence"""
-        print("\n💾 Testing Chroma Index Storage...")
+        self._log("\n💾 Testing Chroma Index Storage...")
         
         # Get collection info to check document count
-        response = requests.get(f"{self.base_url}/collection/info")
-        self.assertEqual(response.status_code, 200)
+        status, collection_info = await self.collection.get_info()
+        self.assertEqual(status, 200)
         
-        collection_info = response.json()
         initial_count = collection_info['document_count']
         
         # Add a test document
@@ -247,33 +461,33 @@ class TestEmbeddingService(unittest.TestCase):
             "metadata": {"test_type": "index_storage", "timestamp": str(time.time())}
         }
         
-        response = requests.post(f"{self.base_url}/documents/text", json=text_data)
-        self.assertEqual(response.status_code, 201)
+        status, _ = await self._fetch("POST", "/documents/text", json=text_data)
+        self.collection.invalidate()
+        self.assertEqual(status, 201)
         
-        # Check if document count increased
-        response = requests.get(f"{self.base_url}/collection/info")
-        updated_info = response.json()
-        self.assertEqual(updated_info['document_count'], initial_count + 1)
-        
-        # Test that document can be found via search
+        # Check the document count increased and the document can be found via search
         search_data = {"query": "test document index storage", "k": 1}
-        response = requests.post(f"{self.base_url}/search/", json=search_data)
-        search_result = response.json()
+        (_, updated_info), (_, search_result) = await asyncio.gather(
+            self.collection.get_info(expected_count=initial_count + 1),
+            self._fetch("POST", "/search/", json=search_data)
+        )
+        self.assertEqual(updated_info['document_count'], initial_count + 1)
         
         # Should find at least one result
         self.assertGreater(search_result['count'], 0)
         
-        print(f"✅ Chroma index storage validated (documents: {updated_info['document_count']})")
+        self._log(f"✅ Chroma index storage validated (documents: {updated_info['document_count']})")
     
-    def test_07_cache_functionality(self):
+    @SERIAL
+    @async_test
+    async def test_07_cache_functionality(self):
         """Test Case 7: Test cache functionality"""
-        print("\n⚡ Testing Cache Functionality...")
+        self._log("\n⚡ Testing Cache Functionality...")
         
         # Get initial cache stats
-        response = requests.get(f"{self.base_url}/cache/stats")
-        self.assertEqual(response.status_code, 200)
+        status, initial_stats = await self._fetch("GET", "/cache/stats")
+        self.assertEqual(status, 200)
         
-        initial_stats = response.json()
         self.assertIn('cache_hits', initial_stats)
         self.assertIn('cache_misses', initial_stats)
         self.assertIn('cache_size', initial_stats)
@@ -287,37 +501,34 @@ class TestEmbeddingService(unittest.TestCase):
         embed_data = {"text": test_text}
         
         # First request (should be cache miss)
-        response1 = requests.post(f"{self.base_url}/embed/", json=embed_data)
-        self.assertEqual(response1.status_code, 200)
+        status1, result1 = await self._fetch("POST", "/embed/", json=embed_data)
+        self.assertEqual(status1, 200)
         
         # Second request (should be cache hit)
-        response2 = requests.post(f"{self.base_url}/embed/", json=embed_data)
-        self.assertEqual(response2.status_code, 200)
+        status2, result2 = await self._fetch("POST", "/embed/", json=embed_data)
+        self.assertEqual(status2, 200)
         
         # Check that both responses are identical
-        result1 = response1.json()
-        result2 = response2.json()
-        self.assertEqual(result1['embedding'], result2['embedding'])
+        self.assertEqual(_fingerprint(result1['embedding']), _fingerprint(result2['embedding']))
         
         # Get updated cache stats
-        response = requests.get(f"{self.base_url}/cache/stats")
-        updated_stats = response.json()
+        _, updated_stats = await self._fetch("GET", "/cache/stats")
         
         # Cache hits should have increased
-        self.assertGreaterEqual(updated_stats['cache_hits'], initial_hits)
+        self.assertGreater(updated_stats['cache_hits'], initial_hits)
         
         # Test cache clearing
-        response = requests.post(f"{self.base_url}/cache/clear")
-        self.assertEqual(response.status_code, 200)
+        status, _ = await self._fetch("POST", "/cache/clear")
+        self.assertEqual(status, 200)
         
         # Check cache stats after clearing
-        response = requests.get(f"{self.base_url}/cache/stats")
-        cleared_stats = response.json()
+        _, cleared_stats = await self._fetch("GET", "/cache/stats")
         
-        print(f"✅ Cache functionality validated (hits: {updated_stats['cache_hits']}, misses: {updated_stats['cache_misses']})")
+        self._log(f"✅ Cache functionality validated (hits: {updated_stats['cache_hits']}, misses: {updated_stats['cache_misses']})")
     
-    def _create_test_pdf_content(self) -> bytes:
-        """Create simple PDF content for testing"""
+    @staticmethod
+    def _create_test_pdf_content() -> bytes:
+        """Create simple PDF content for testing (built once, in setUpClass)"""
         # This creates a minimal PDF structure for testing
         # In a real scenario, you might want to use a library like reportlab
         pdf_header = b'%PDF-1.4\n'
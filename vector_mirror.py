@@ -0,0 +1,140 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorMirror:
+    """In-process flat index mirroring the Chroma collection
+
+    For small collections a brute-force scan is faster than Chroma's HNSW
+    query pipeline. Vectors are held int8-quantized with a per-vector scale
+    (a quarter of the float32 footprint), so scores are approximate: callers
+    should over-fetch and re-rank candidates against the exact embeddings.
+    Chroma stays the source of truth: the mirror is rebuilt from it on
+    startup, and add() only sees writes made through this process, so owners
+    sharing the collection with other processes must reload it when the
+    collection's count no longer matches ntotal.
+    """
+
+    # Rows dequantized per step of a scan, bounding the float32 scratch space
+    BLOCK_ROWS = 1024
+
+    def __init__(self, dimension: int, max_size: int = 100_000, space: str = "l2"):
+        self.dimension = dimension
+        self.max_size = max_size
+        self.space = space
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._reset_storage()
+
+    def _reset_storage(self, capacity: int = 1024):
+        self._matrix = np.empty((capacity, self.dimension), dtype=np.int8)
+        self._scales = np.empty(capacity, dtype=np.float32)
+        self._sq_norms = np.empty(capacity, dtype=np.float32)
+        self._ids: List[str] = []
+        self._id_index: Dict[str, int] = {}
+
+    @property
+    def ntotal(self) -> int:
+        return len(self._ids)
+
+    def load(self, collection, page_size: int = 1000):
+        """Populate the mirror from an existing collection"""
+        count = collection.count()
+        if count > self.max_size:
+            self.disable()
+            return
+
+        for offset in range(0, count, page_size):
+            page = collection.get(include=["embeddings"], limit=page_size, offset=offset)
+            if len(page['ids']) > 0:
+                self.add(page['ids'], np.asarray(page['embeddings'], dtype=np.float32))
+        logger.info("Vector mirror loaded %s embeddings", self.ntotal)
+
+    def add(self, ids: List[str], embeddings: np.ndarray):
+        """Add embeddings, ignoring IDs already present (as Chroma does)"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            new_rows = [i for i, doc_id in enumerate(ids) if doc_id not in self._id_index]
+            if not new_rows:
+                return
+
+            start = len(self._ids)
+            end = start + len(new_rows)
+            if end > self.max_size:
+                self._disable_locked()
+                return
+
+            if end > self._matrix.shape[0]:
+                # Grow into new arrays so concurrent searches keep valid snapshots
+                capacity = max(end, self._matrix.shape[0] * 2)
+                matrix = np.empty((capacity, self.dimension), dtype=np.int8)
+                matrix[:start] = self._matrix[:start]
+                scales = np.empty(capacity, dtype=np.float32)
+                scales[:start] = self._scales[:start]
+                sq_norms = np.empty(capacity, dtype=np.float32)
+                sq_norms[:start] = self._sq_norms[:start]
+                self._matrix, self._scales, self._sq_norms = matrix, scales, sq_norms
+
+            rows = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dimension)[new_rows]
+            scales = np.abs(rows).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._matrix[start:end] = np.round(rows / scales[:, None]).astype(np.int8)
+            self._scales[start:end] = scales
+            self._sq_norms[start:end] = np.einsum('ij,ij->i', rows, rows)
+            for offset, i in enumerate(new_rows):
+                self._id_index[ids[i]] = start + offset
+            # Replace rather than extend so snapshots taken by search stay consistent
+            self._ids = self._ids + [ids[i] for i in new_rows]
+
+    def search(self, query_embedding: np.ndarray, k: int) -> Tuple[List[str], List[float]]:
+        """Approximate k-nearest-neighbour search returning (ids, distances)"""
+        with self._lock:
+            ids = self._ids
+            n = len(ids)
+            matrix = self._matrix[:n]
+            scales = self._scales[:n]
+            sq_norms = self._sq_norms[:n]
+
+        if n == 0:
+            return [], []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        dots = np.empty(n, dtype=np.float32)
+        for start in range(0, n, self.BLOCK_ROWS):
+            block = matrix[start:start + self.BLOCK_ROWS]
+            dots[start:start + len(block)] = block.astype(np.float32) @ query
+        dots *= scales
+        if self.space == "ip":
+            distances = 1.0 - dots
+        else:
+            # Squared L2, matching Chroma's "l2" space
+            distances = sq_norms - 2.0 * dots + float(query @ query)
+
+        k = min(k, n)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [ids[i] for i in top], distances[top].tolist()
+
+    def reset(self):
+        """Empty the mirror (and re-enable it)"""
+        with self._lock:
+            self._reset_storage()
+            self.enabled = True
+
+    def disable(self, reason: Optional[str] = None):
+        """Stop mirroring, by default because the collection outgrew max_size"""
+        with self._lock:
+            self._disable_locked(reason)
+
+    def _disable_locked(self, reason: Optional[str] = None):
+        if self.enabled:
+            logger.info("Vector mirror disabled: %s", reason or f"collection exceeds {self.max_size} documents")
+        self.enabled = False
+        self._reset_storage(capacity=0)